@@ -0,0 +1,348 @@
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+from .backend import BACKEND, open_canvas
+from .emit import PRECISION, emitter
+from .icon import ACCENT, SIDE, l_faces, notch_faces
+from .incremental import build
+from .parts import part_shapes
+from .projection import ISO, project
+from .raster import ANIMATED_FORMATS, encode_animation
+from .template import THEMES
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+FORMATS = ("svg", *ANIMATED_FORMATS)
+# File extension of each format; APNG files are valid PNGs.
+EXTENSIONS = {"svg": "svg", "apng": "png", "gif": "gif", "webp": "webp"}
+FRAMES = 48
+FPS = 24
+STROKE_W = 6
+
+# Cube corner i sits at (x, y, z) = bits 0, 1 and 2 of i.
+CORNER_BITS = np.array([[(i >> k) & 1 for k in range(3)] for i in range(8)])
+# Corner indices of each face, in order around it. Top, left (x=0) and
+# front (y=0) come first, in the order of the icon's L and notch regions.
+CUBE_FACES = np.array(
+    [
+        [4, 5, 7, 6],  # top
+        [0, 2, 6, 4],  # left
+        [0, 1, 5, 4],  # front
+        [0, 1, 3, 2],  # bottom
+        [1, 3, 7, 5],  # right
+        [2, 3, 7, 6],  # back
+    ]
+)
+# A face whose normal is this close to edge-on is not drawn.
+EDGE_ON = 1e-9
+
+
+def turn_z(angles):
+    """(F, 3, 3) rotation matrices about the vertical (z) axis."""
+    c, s = np.cos(angles), np.sin(angles)
+    rot = np.zeros((len(angles), 3, 3))
+    rot[:, 0, 0], rot[:, 0, 1] = c, -s
+    rot[:, 1, 0], rot[:, 1, 1] = s, c
+    rot[:, 2, 2] = 1
+    return rot
+
+
+def sweep(points, rotations, centre, cam=ISO):
+    """Project (V, 3) `points` turned about `centre` by each of `rotations`.
+
+    Every frame is transformed and projected in one pass; returns an
+    (F, V, 2) array of screen points.
+    """
+    model = np.asarray(points, dtype=float) - centre
+    turned = np.einsum("fij,vj->fvi", rotations, model)
+    screen = project(turned.reshape(-1, 3), cam) + project([centre], cam)
+    return screen.reshape(len(rotations), -1, 2)
+
+
+def spin(n=FRAMES, s=SIDE, cam=ISO):
+    """The icon cube turning once about its vertical axis, in `n` frames.
+
+    Returns (frames, extent). Each frame lists (kind, geometry, paint)
+    layers, kind being "fill" (a list of polygons) or "stroke" (an
+    (N, 2, 2) array of segments) and paint a colour slot. The cube is
+    convex, so its faces turned towards the viewer never overlap and need
+    no sorting; the notch and L are drawn over the faces they lie on.
+    """
+    corners = s * CORNER_BITS
+    centre = np.full(3, s / 2)
+    decals = [*notch_faces(s), *l_faces(s)]
+    rot = turn_z(2 * np.pi * np.arange(n) / n)
+
+    screen = sweep(np.concatenate([corners, *decals]), rot, centre, cam)
+    ends = np.cumsum([len(corners)] + [len(d) for d in decals])
+    corners_2d, *decals_2d = np.split(screen, ends[:-1], axis=1)
+    notch_2d, l_2d = decals_2d[:3], decals_2d[3:]
+
+    normals = (corners[CUBE_FACES].mean(axis=1) - centre) / (s / 2)
+    facing = np.einsum("fij,nj->fni", rot, normals) @ cam[:, 2]
+
+    frames = []
+    for i in range(n):
+        faces = np.flatnonzero(facing[i] < -EDGE_ON)
+        edges = sorted(
+            {
+                tuple(sorted((quad[k], quad[k - 1])))
+                for quad in CUBE_FACES[faces]
+                for k in range(4)
+            }
+        )
+        decal = [f for f in faces if f < 3]
+        frames.append(
+            [
+                ("fill", [corners_2d[i, quad] for quad in CUBE_FACES[faces]], "bg"),
+                ("fill", [notch_2d[f][i] for f in decal], "accent"),
+                ("fill", [l_2d[f][i] for f in decal], "fg"),
+                ("stroke", corners_2d[i, np.array(edges)], "fg"),
+            ]
+        )
+    flat = corners_2d.reshape(-1, 2)
+    return frames, (*flat.min(axis=0).tolist(), *flat.max(axis=0).tolist())
+
+
+def assemble(n=FRAMES, lift=SIDE / 3, cam=ISO):
+    """The 3D parts rising apart and settling back together, in `n` frames.
+
+    Parts are drawn back to front and each rises `lift` further than the
+    part behind it, so the teal box ends highest; the motion eases in and
+    out and the sequence loops. Returns (frames, extent) as spin() does,
+    with literal colours as paints.
+    """
+    solids = list(part_shapes()[2])[::-1]
+    t = (1 - np.cos(2 * np.pi * np.arange(n) / n)) / 2
+    heights = np.outer(t, np.arange(len(solids)) * lift)
+    model = np.zeros((n, len(solids), 3))
+    model[..., 2] = heights
+    shifts = project(model.reshape(-1, 3), cam).reshape(n, len(solids), 2)
+
+    frames = []
+    for i in range(n):
+        layers = []
+        for part, shift in zip(solids, shifts[i]):
+            for verts, colour in part.faces():
+                layers.append(("fill", [verts + shift], colour))
+            layers.append(("stroke", part.segments + shift, "black"))
+        frames.append(layers)
+
+    pts = np.concatenate(
+        [part.points[None] + shifts[:, p, None] for p, part in enumerate(solids)],
+        axis=1,
+    ).reshape(-1, 2)
+    return frames, (*pts.min(axis=0).tolist(), *pts.max(axis=0).tolist())
+
+
+ANIMATIONS = {"spin": spin, "assemble": assemble}
+
+
+def frame_size(extent):
+    """Canvas (width, height) and drawing offset for a sequence's extent."""
+    pad = STROKE_W / 2
+    x_min, y_min, x_max, y_max = extent
+    size = (x_max - x_min + 2 * pad, y_max - y_min + 2 * pad)
+    return size, (pad - x_min, pad - y_min)
+
+
+def draw_frame(out, frame, offset, colours):
+    """Draw one frame's layers through emitter `out`, shifted by `offset`."""
+    for kind, geometry, paint in frame:
+        paint = colours.get(paint, paint)
+        if kind == "fill":
+            if len(geometry):
+                pieces = [piece + offset for piece in geometry]
+                out.polygons(pieces, fill=paint, stroke="none")
+        else:
+            out.lines(
+                geometry + offset,
+                stroke=paint,
+                stroke_width=STROKE_W,
+                stroke_linecap="round",
+            )
+
+
+def frame_svgs(
+    frames, extent, colours, precision=PRECISION, backend=BACKEND, symbols=False
+):
+    """One standalone SVG (bytes) per frame."""
+    size, offset = frame_size(extent)
+    svgs = []
+    for frame in frames:
+        buf = io.StringIO()
+        canvas = open_canvas(buf, size, backend)
+        out = emitter(canvas, precision, symbols)
+        draw_frame(out, frame, offset, colours)
+        out.close()
+        canvas.close()
+        svgs.append(buf.getvalue().encode())
+    return svgs
+
+
+def animated_svg(
+    frames,
+    extent,
+    colours,
+    fps=FPS,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+):
+    """All frames in one SVG, each group shown in turn by SMIL <animate>.
+
+    The first frame is visible by default, so viewers without SMIL show a
+    still.
+    """
+    size, offset = frame_size(extent)
+    n = len(frames)
+    buf = io.StringIO()
+    canvas = open_canvas(buf, size, backend)
+    for i, frame in enumerate(frames):
+        canvas.begin_group(visibility="visible" if i == 0 else "hidden")
+        canvas.animate(
+            attributeName="visibility",
+            values="visible;hidden",
+            keyTimes=f"0;{1 / n:g}",
+            calcMode="discrete",
+            dur=f"{n / fps:g}s",
+            begin=f"{i / fps:g}s",
+            repeatCount="indefinite",
+        )
+        out = emitter(canvas, precision, symbols)
+        draw_frame(out, frame, offset, colours)
+        out.close()
+        canvas.end_group()
+    canvas.close()
+    return buf.getvalue().encode()
+
+
+def _raster_frame(svg, width):
+    from .raster import render
+
+    im = render(svg, width)
+    return im.size, im.tobytes()
+
+
+def rasterize_frames(svgs, width=None, workers=None):
+    """Rasterize frame `svgs` to RGBA images across a process pool."""
+    from PIL import Image
+
+    workers = min(workers or os.cpu_count() or 1, len(svgs))
+    if workers > 1:
+        chunksize = max(1, len(svgs) // (workers * 4))
+        with ProcessPoolExecutor(workers) as pool:
+            raw = list(
+                pool.map(_raster_frame, svgs, repeat(width), chunksize=chunksize)
+            )
+    else:
+        raw = list(map(_raster_frame, svgs, repeat(width)))
+    return [Image.frombytes("RGBA", size, data) for size, data in raw]
+
+
+def artifacts(
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    names=tuple(ANIMATIONS),
+    formats=("svg",),
+    frames=FRAMES,
+    fps=FPS,
+    width=None,
+    workers=None,
+):
+    """(filenames, params, render) for each animation, in every format.
+
+    The spin is drawn in each theme; the parts keep their own colours.
+    Raster formats share one parallel rasterization of the frames.
+    """
+    for name in names:
+        animation = ANIMATIONS[name]
+        themes = THEMES if name == "spin" else {"": {}}
+        for theme, colours in themes.items():
+            colours = {"accent": ACCENT, **colours}
+            stem = "-".join(filter(None, (name, theme)))
+
+            def render(animation=animation, colours=colours):
+                seq, extent = animation(frames)
+                opts = dict(precision=precision, backend=backend, symbols=symbols)
+                data, images = [], None
+                for fmt in formats:
+                    if fmt == "svg":
+                        data.append(animated_svg(seq, extent, colours, fps, **opts))
+                        continue
+                    if images is None:
+                        svgs = frame_svgs(seq, extent, colours, **opts)
+                        images = rasterize_frames(svgs, width, workers)
+                    data.append(encode_animation(images, fmt, fps))
+                return data
+
+            params = dict(
+                colours=colours,
+                frames=frames,
+                fps=fps,
+                width=width,
+                precision=precision,
+                backend=backend,
+                symbols=symbols,
+            )
+            names_out = tuple(f"{stem}.{EXTENSIONS[fmt]}" for fmt in formats)
+            yield names_out, params, render
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.animate", description="Render looping logo animations."
+    )
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="animation",
+        help=f"any of {', '.join(ANIMATIONS)} (default: all)",
+    )
+    parser.add_argument("-f", "--formats", nargs="+", choices=FORMATS, default=["svg"])
+    parser.add_argument("-n", "--frames", type=int, default=FRAMES)
+    parser.add_argument("--fps", type=float, default=FPS)
+    parser.add_argument("-w", "--width", type=int, help="raster width in px")
+    parser.add_argument("-j", "--jobs", type=int, help="raster worker processes")
+    parser.add_argument("-o", "--out-dir", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in ANIMATIONS]
+    if unknown:
+        parser.error(f"unknown animation(s): {', '.join(unknown)}")
+    if args.frames < 1:
+        parser.error("--frames must be at least 1")
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.width is not None and args.width < 1:
+        parser.error("--width must be at least 1")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    t0 = time.perf_counter()
+    counts = build(
+        __name__,
+        artifacts(
+            names=args.names or tuple(ANIMATIONS),
+            formats=args.formats,
+            frames=args.frames,
+            fps=args.fps,
+            width=args.width,
+            workers=args.jobs,
+        ),
+        args.out_dir,
+    )
+    wall = time.perf_counter() - t0
+    n = counts["built"] * args.frames
+    print(f"{n} frames in {wall * 1e3:.0f} ms ({n / wall:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from xml.sax.saxutils import escape
+
+from .profiling import count, span
+
+# Backend used when a generator isn't told otherwise.
+BACKEND = "stream"
+
+
+def face_path(pieces):
+    """Full-precision SVG path data for a region made of several polygons."""
+    return " ".join(
+        "M" + " L".join(f"{x},{y}" for x, y in piece) + " Z" for piece in pieces
+    )
+
+
+def _attrs(attrs):
+    """Serialize keyword attributes, svgwrite-style: stroke_width → stroke-width."""
+    return "".join(
+        ' %s="%s"' % (name.replace("_", "-"), escape(str(value), {'"': "&quot;"}))
+        for name, value in attrs.items()
+    )
+
+
+class StreamCanvas:
+    """Write each element to a text `stream` as soon as it is drawn.
+
+    There is no document tree and no validation: what is drawn is what
+    gets written, in order.
+    """
+
+    def __init__(self, stream, size):
+        self.stream = stream
+        self.size = size
+        width, height = size
+        stream.write(
+            '<svg xmlns="http://www.w3.org/2000/svg"'
+            + _attrs(dict(width=width, height=height))
+            + ">"
+        )
+
+    def polygon(self, points, **attrs):
+        points = " ".join(f"{x},{y}" for x, y in points)
+        self._element("polygon", dict(points=points, **attrs))
+
+    def line(self, start, end, **attrs):
+        (x1, y1), (x2, y2) = start, end
+        self._element("line", dict(x1=x1, y1=y1, x2=x2, y2=y2, **attrs))
+
+    def path(self, d, **attrs):
+        self._element("path", dict(d=d, **attrs))
+
+    def region(self, pieces, **attrs):
+        """Fill one region made of several polygons."""
+        self.path(face_path(pieces), **attrs)
+
+    def begin_group(self, **attrs):
+        count("elements")
+        self.stream.write("<g" + _attrs(attrs) + ">")
+
+    def end_group(self):
+        self.stream.write("</g>")
+
+    def begin_defs(self):
+        self.stream.write("<defs>")
+
+    def end_defs(self):
+        self.stream.write("</defs>")
+
+    def begin_symbol(self, id, **attrs):
+        count("elements")
+        self.stream.write("<symbol" + _attrs(dict(id=id, **attrs)) + ">")
+
+    def end_symbol(self):
+        self.stream.write("</symbol>")
+
+    def use(self, href, x, y, **attrs):
+        self._element("use", dict(href=href, x=x, y=y, **attrs))
+
+    def animate(self, **attrs):
+        """A SMIL <animate> of the enclosing element."""
+        self._element("animate", attrs)
+
+    def close(self):
+        self.stream.write("</svg>\n")
+
+    def _element(self, name, attrs):
+        count("elements")
+        self.stream.write("<" + name + _attrs(attrs) + "/>")
+
+
+class SvgwriteCanvas:
+    """Reference backend: build an svgwrite Drawing, written on close().
+
+    Validation is off, as colours may be template slot markers.
+    """
+
+    def __init__(self, stream, size):
+        import svgwrite
+
+        self.stream = stream
+        self.size = size
+        self.dwg = svgwrite.Drawing(size=size, debug=False)
+        self._parents = [self.dwg]
+
+    def polygon(self, points, **attrs):
+        self._add(self.dwg.polygon(points, **attrs))
+
+    def line(self, start, end, **attrs):
+        self._add(self.dwg.line(start=start, end=end, **attrs))
+
+    def path(self, d, **attrs):
+        self._add(self.dwg.path(d=d, **attrs))
+
+    def region(self, pieces, **attrs):
+        self.path(face_path(pieces), **attrs)
+
+    def begin_group(self, **attrs):
+        group = self.dwg.g(**attrs)
+        self._add(group)
+        self._parents.append(group)
+
+    def end_group(self):
+        self._parents.pop()
+
+    def begin_defs(self):
+        self._parents.append(self.dwg.defs)
+
+    def end_defs(self):
+        self._parents.pop()
+
+    def begin_symbol(self, id, **attrs):
+        symbol = self.dwg.symbol(id=id, **attrs)
+        self._add(symbol)
+        self._parents.append(symbol)
+
+    def end_symbol(self):
+        self._parents.pop()
+
+    def use(self, href, x, y, **attrs):
+        self._add(self.dwg.use(href, insert=(x, y), **attrs))
+
+    def animate(self, **attrs):
+        self._add(self.dwg.animate(**attrs))
+
+    def close(self):
+        with span("svgwrite", "serialize"):
+            self.dwg.write(self.stream)
+
+    def _add(self, element):
+        count("elements")
+        self._parents[-1].add(element)
+
+
+BACKENDS = {"stream": StreamCanvas, "svgwrite": SvgwriteCanvas}
+
+
+def open_canvas(stream, size, backend=BACKEND):
+    """Start a (width, height) drawing on `stream` with the named backend.
+
+    `backend` may also be a canvas factory taking (stream, size), such as
+    a painter from paint.py.
+    """
+    if callable(backend):
+        return backend(stream, size)
+    try:
+        canvas = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown backend {backend!r}") from None
+    return canvas(stream, size)
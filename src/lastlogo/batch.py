@@ -0,0 +1,302 @@
+import importlib
+import json
+import os
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import product
+from pathlib import Path
+
+from .paint import PAINTERS, paint, paint_image
+from .profiling import span
+from .raster import ICO_MAX, RASTER_FORMATS
+from .sink import DirSink, open_sink
+from .template import THEMES
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+# Assets with a colour-slot template, by module name.
+ASSETS = ("icon", "wordmark", "logo")
+FORMATS = ("svg", "pdf", *RASTER_FORMATS)
+# Formats written once per job, whatever the sizes.
+SIZELESS = ("svg", "pdf", "ico")
+# Spec keys passed on to the asset templates.
+OPTIONS = ("precision", "backend", "symbols", "outline")
+# Generator modules whose artifacts include SVGs.
+GENERATORS = ("icon", "wordmark", "logo", "parts")
+
+
+def load_spec(path):
+    """Read a variant matrix spec from a JSON or YAML file."""
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError(f"{path}: YAML specs need PyYAML") from None
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def expand(spec, out_dir):
+    """Expand a variant matrix into one job per asset and theme.
+
+    spec keys (all optional):
+      assets: subset of ASSETS (default: all)
+      themes: {name: {fg, bg, accent}}, or names from THEMES
+      sizes: raster widths in px; null is the asset's own size
+      formats: subset of FORMATS (default: svg)
+      square: pad PNG/WebP output to squares, e.g. for app icons
+      precision, backend, symbols, outline: passed to the asset templates
+      painter: paint rasters directly with this paint.PAINTERS entry
+        instead of rasterizing the SVG; PDFs are always painted by Cairo
+
+    A job lists every (size, format, filename) it writes. SVG output doesn't
+    depend on size, so it is written once; an .ico holds every size up to
+    ICO_MAX. With no `out_dir`, jobs return their files instead of writing
+    them.
+    """
+    assets = spec.get("assets", ASSETS)
+    themes = spec.get("themes", THEMES)
+    if not isinstance(themes, dict):
+        unknown = [name for name in themes if name not in THEMES]
+        if unknown:
+            raise ValueError(f"unknown theme(s) {unknown}; define their colours")
+        themes = {name: THEMES[name] for name in themes}
+    sizes = spec.get("sizes", [None])
+    formats = spec.get("formats", ["svg"])
+    opts = {k: spec[k] for k in OPTIONS if k in spec}
+    painter = spec.get("painter")
+    if painter is not None and painter not in PAINTERS:
+        raise ValueError(f"unknown painter {painter!r}")
+
+    for asset in assets:
+        if asset not in ASSETS:
+            raise ValueError(f"unknown asset {asset!r}")
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt!r}")
+    if "ico" in formats and not any(size and size <= ICO_MAX for size in sizes):
+        raise ValueError(f"an .ico needs a size of at most {ICO_MAX} px")
+
+    jobs = []
+    for asset, theme in product(assets, themes):
+        outputs = []
+        for fmt, size in product(formats, sizes):
+            if fmt == "ico" and not (size and size <= ICO_MAX):
+                continue
+            suffix = f"-{size}" if size and fmt not in SIZELESS else ""
+            outputs.append((size, fmt, f"{asset}-{theme}{suffix}.{fmt}"))
+        jobs.append(
+            dict(
+                asset=asset,
+                theme=theme,
+                colours=themes[theme],
+                outputs=outputs,
+                out_dir=None if out_dir is None else str(out_dir),
+                square=spec.get("square", False),
+                opts=opts,
+                painter=painter,
+            )
+        )
+    return jobs
+
+
+def svg_artifacts(generators=GENERATORS, **opts):
+    """Yield (filename, svg bytes) for every SVG the generators write.
+
+    `opts`, such as symbols=True, are passed to each generator's artifacts().
+    """
+    for generator in generators:
+        module = importlib.import_module("." + generator, __package__)
+        for names, _, render in module.artifacts(**opts):
+            for name, data in zip(names, render(), strict=True):
+                if name.endswith(".svg"):
+                    yield name, data
+
+
+def _template(asset, opts):
+    module = importlib.import_module("." + asset, __package__)
+    return getattr(module, f"{asset}_template")(**opts)
+
+
+def _drawing(asset):
+    module = importlib.import_module("." + asset, __package__)
+    return getattr(module, f"{asset}_drawing")
+
+
+def _warm(assets, opts):
+    """Worker initializer: build each asset's geometry and template once."""
+    for asset in assets:
+        _template(asset, opts)
+
+
+def fingerprint(job):
+    """Incremental-build key of a job: asset, batch and raster source, parameters."""
+    from .incremental import fingerprint
+
+    # The job runner itself, the SVG emitter and the rasterizers: options are
+    # interpreted in batch and emit, not only in the asset module
+    modules = (job["asset"], "batch", "emit", "raster")
+    if job.get("painter") or any(fmt == "pdf" for _, fmt, _ in job["outputs"]):
+        modules += ("paint",)
+    params = {k: v for k, v in job.items() if k not in ("out_dir", "cache_dir")}
+    return fingerprint(modules, [name for *_, name in job["outputs"]], params)
+
+
+def run_job(job):
+    """Render one job; return (name, files, bytes, seconds, hashes, data).
+
+    All raster outputs of the job come from a single rasterization. With a
+    "cache_dir", the files also go to that artifact store and `hashes` maps
+    each filename to its content hash. Files are written to the job's
+    "out_dir"; without one, `data` holds them as {filename: bytes}.
+    """
+    t0 = time.perf_counter()
+    tpl = _template(job["asset"], job["opts"])
+    svg = tpl.render(**job["colours"])
+    # Painted output honours outline mode; the rest of `opts` is about SVG
+    paint_kw = dict(job["colours"], outline=job["opts"].get("outline", False))
+    files = {}
+    raster = []
+    for size, fmt, filename in job["outputs"]:
+        if fmt == "svg":
+            files[filename] = svg
+        elif fmt == "pdf":
+            files[filename] = paint(
+                _drawing(job["asset"]), "pdf", painter="cairo", **paint_kw
+            )
+        else:
+            raster.append((size, fmt, filename))
+    if raster:
+        from .raster import raster_set
+
+        source = svg
+        if job.get("painter"):
+            source = partial(
+                paint_image,
+                _drawing(job["asset"]),
+                painter=job["painter"],
+                **paint_kw,
+            )
+        data = raster_set(
+            source,
+            [(size, fmt) for size, fmt, _ in raster],
+            native_width=round(tpl.size[0]),
+            square_all=job["square"],
+        )
+        files.update(zip((filename for *_, filename in raster), data))
+    if job["out_dir"] is not None:
+        for filename, data in files.items():
+            (Path(job["out_dir"]) / filename).write_bytes(data)
+    hashes = None
+    if job.get("cache_dir"):
+        from .incremental import Store
+
+        store = Store(job["cache_dir"])
+        hashes = {filename: store.put(data) for filename, data in files.items()}
+    name = f"{job['asset']}-{job['theme']}"
+    written = sum(len(data) for data in files.values())
+    data = None if job["out_dir"] is not None else files
+    return name, len(files), written, time.perf_counter() - t0, hashes, data
+
+
+def _run_chunk(jobs):
+    return [run_job(job) for job in jobs]
+
+
+def run_batch(jobs, workers=None, window=None):
+    """Render `jobs` across a process pool; yield (job, run_job() result).
+
+    Results come in the order jobs finish. At most `window` chunks of jobs
+    (default: two per worker) are queued or running at once, so results
+    that carry file bytes never pile up, however long the batch. Each
+    worker warms the geometry of every asset in the batch when it starts,
+    so jobs only fill in colours and rasterize.
+    """
+    if not jobs:
+        return
+    workers = workers or os.cpu_count() or 1
+    window = window or 2 * workers
+    for job in jobs:
+        if job["out_dir"] is not None:
+            Path(job["out_dir"]).mkdir(parents=True, exist_ok=True)
+    assets = sorted({job["asset"] for job in jobs})
+    opts = jobs[0]["opts"]
+    chunksize = max(1, min(len(jobs) // (workers * 4), 64))
+    chunks = [jobs[i : i + chunksize] for i in range(0, len(jobs), chunksize)]
+    with ProcessPoolExecutor(
+        workers, initializer=_warm, initargs=(assets, opts)
+    ) as pool:
+        pending = {}
+        for chunk in chunks:
+            pending[pool.submit(_run_chunk, chunk)] = chunk
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from zip(pending.pop(future), future.result())
+        for future in list(pending):
+            yield from zip(pending.pop(future), future.result())
+
+
+def summary(results, wall, workers):
+    """Print per-job timings, then totals for the batch."""
+    for name, count, size, seconds, *_ in sorted(results, key=lambda r: -r[3]):
+        print(f"{seconds * 1e3:8.2f} ms  {count:3} files {size:>10,} B  {name}")
+    times = [r[3] for r in results]
+    busy = sum(times)
+    files = sum(r[1] for r in results)
+    print(
+        f"{len(results)} jobs ({files} files) in {wall * 1e3:.0f} ms wall"
+        f" on {workers} workers ({busy * 1e3:.0f} ms in jobs);"
+        f" median {statistics.median(times) * 1e3:.2f} ms,"
+        f" max {max(times) * 1e3:.2f} ms"
+    )
+
+
+def main(spec_path, out_dir=None, workers=None, store=None, force=False):
+    """Run a spec; with a Store, jobs whose fingerprint matches are skipped.
+
+    `out_dir` is a directory, or anything else sink.open_sink() takes:
+    files then stream into the sink as each job finishes.
+    """
+    spec = load_spec(spec_path)
+    out_dir = out_dir or spec.get("out_dir") or OUTPUT_DIR
+    sink = open_sink(out_dir)
+    try:
+        _run(spec, sink, workers, store, force)
+    finally:
+        if sink is not out_dir:
+            sink.close()
+
+
+def _run(spec, sink, workers, store, force):
+    workers = workers or os.cpu_count() or 1
+    # Workers write straight into a directory; anything else is fed here
+    jobs = expand(spec, sink.dir if isinstance(sink, DirSink) else None)
+    t0 = time.perf_counter()
+    skipped = 0
+    if store is not None:
+        pending = []
+        for job in jobs:
+            if not force and store.restore(fingerprint(job), sink):
+                skipped += 1
+                continue
+            pending.append(dict(job, cache_dir=str(store.dir)))
+        jobs = pending
+    results = []
+    with span("run_batch", "batch", jobs=len(jobs), workers=workers):
+        for job, (*result, data) in run_batch(jobs, workers):
+            for filename, content in (data or {}).items():
+                sink.write(filename, content)
+            if store is not None:
+                store.record(fingerprint(job), result[4])
+            results.append(result)
+    if store is not None:
+        store.save()
+    if results:
+        summary(results, time.perf_counter() - t0, workers)
+    if skipped:
+        print(f"{skipped} jobs up to date")
@@ -0,0 +1,317 @@
+import argparse
+import io
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .cache import CACHES
+
+# name → (group, factory); a factory returns the zero-argument callable to time.
+BENCHMARKS = {}
+# Raster widths benchmarked for the logo.
+RASTER_WIDTHS = (16, 64, 512)
+# Relative slowdown of the fastest run that compare() reports as a regression.
+THRESHOLD = 0.10
+
+_ELEMENT_RE = re.compile(rb"<[a-zA-Z]")
+
+
+def benchmark(group, name=None):
+    """Register a benchmark factory under `group` ("micro" or "macro")."""
+
+    def register(factory):
+        BENCHMARKS[name or factory.__name__] = (group, factory)
+        return factory
+
+    return register
+
+
+def cold(fn):
+    """Wrap `fn` to run with every geometry cache emptied first."""
+
+    def run():
+        for cache in CACHES.values():
+            cache.clear()
+        return fn()
+
+    return run
+
+
+def svg_output(drawing, **kw):
+    """Run a *_drawing() function into a buffer; return the SVG bytes."""
+
+    def run():
+        stream = io.StringIO()
+        drawing(stream, **kw)
+        return stream.getvalue().encode()
+
+    return run
+
+
+@benchmark("micro")
+def iso_project():
+    from .projection import project
+
+    points = np.random.default_rng(0).uniform(0, 300, (4096, 3))
+    return lambda: project(points)
+
+
+@benchmark("micro")
+def bar():
+    from .wordmark import bar
+
+    return lambda: bar(0, 0, 15, 70, 15)
+
+
+@benchmark("micro")
+def make_text():
+    from .wordmark import make_text
+
+    return make_text.__wrapped__
+
+
+@benchmark("micro")
+def l_shape():
+    from .icon import SIDE, l_shape
+
+    return lambda: l_shape.__wrapped__(SIDE)
+
+
+@benchmark("micro")
+def place_text():
+    from .glyphs import GLYPHS
+    from .wordmark import visible_text
+
+    visible_text(text="".join(GLYPHS))  # warm every glyph
+    return lambda: visible_text(text="LAST 2 DEV")
+
+
+@benchmark("macro")
+def draw_icon():
+    from .icon import icon_drawing
+
+    return cold(svg_output(icon_drawing))
+
+
+@benchmark("macro")
+def draw_wordmark():
+    from .wordmark import wordmark_drawing
+
+    return cold(svg_output(wordmark_drawing))
+
+
+@benchmark("macro")
+def logo():
+    from .logo import logo_drawing
+
+    return cold(svg_output(logo_drawing))
+
+
+@benchmark("macro")
+def logo_template_render():
+    from .logo import logo_template
+
+    tpl = logo_template()
+    return lambda: tpl.render(fg="white", bg="black")
+
+
+@benchmark("macro")
+def spin_frames():
+    from .animate import FRAMES, animated_svg, spin
+    from .icon import ACCENT
+
+    colours = dict(fg="black", bg="white", accent=ACCENT)
+
+    def run():
+        frames, extent = spin(FRAMES)
+        return animated_svg(frames, extent, colours)
+
+    return run
+
+
+def _raster(width):
+    def factory():
+        from .logo import logo_template
+        from .raster import raster_set
+
+        svg = logo_template().render()
+        return lambda: raster_set(svg, [(width, "png")])[0]
+
+    return factory
+
+
+def _paint(width, painter):
+    def factory():
+        from .logo import logo_drawing
+        from .paint import paint
+
+        return lambda: paint(logo_drawing, "png", width, painter)
+
+    return factory
+
+
+for _width in RASTER_WIDTHS:
+    benchmark("macro", f"raster_png_{_width}")(_raster(_width))
+    for _painter in ("cairo", "pillow"):
+        benchmark("macro", f"paint_{_painter}_{_width}")(_paint(_width, _painter))
+
+
+def metrics(result):
+    """Output size and element count of a benchmark's return value."""
+    if isinstance(result, bytes):
+        out = dict(bytes=len(result))
+        if result.lstrip().startswith(b"<"):
+            out["elements"] = len(_ELEMENT_RE.findall(result))
+        return out
+    if isinstance(result, np.ndarray):
+        return dict(elements=int(result.shape[0]))
+    if isinstance(result, (list, tuple)):
+        return dict(elements=len(result))
+    return {}
+
+
+def measure(fn, repeat=5, min_time=0.1):
+    """Time `fn` like timeit: calibrate a loop count, then take `repeat` runs.
+
+    Returns (loops, per-call seconds of each run).
+    """
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        runs.append((time.perf_counter() - t0) / loops)
+    return loops, runs
+
+
+def run(names=None, repeat=5, min_time=0.1):
+    """Run the selected benchmarks; return {name: result dict}.
+
+    Benchmarks whose optional dependencies are missing are recorded as
+    skipped rather than failing the run.
+    """
+    results = {}
+    for name, (group, factory) in BENCHMARKS.items():
+        if names and not any(re.search(n, name) for n in names):
+            continue
+        try:
+            fn = factory()
+            out = metrics(fn())
+        except (ImportError, OSError) as e:
+            # e.g. cairosvg, or the cairo library it loads
+            reason = str(e).splitlines()[0]
+            results[name] = dict(group=group, skipped=reason)
+            print(f"{name:<22} skipped ({reason})")
+            continue
+        loops, runs = measure(fn, repeat, min_time)
+        results[name] = dict(
+            group=group,
+            loops=loops,
+            min_s=min(runs),
+            median_s=statistics.median(runs),
+            **out,
+        )
+        print(f"{name:<22} {format_time(statistics.median(runs))}  {describe(out)}")
+    return results
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit:<2}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def describe(out):
+    return "  ".join(f"{v:,} {k}" for k, v in out.items())
+
+
+def environment():
+    return dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        machine=platform.machine(),
+        system=platform.system(),
+    )
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Print each benchmark against `baseline`; return the regressed names.
+
+    A benchmark regresses when its fastest run is more than `threshold`
+    slower; the minimum is the timing least disturbed by other load.
+    Changed byte sizes or element counts are reported too, since they mean
+    the output itself changed.
+    """
+    regressed = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None or "min_s" not in old or "min_s" not in new:
+            continue
+        ratio = new["min_s"] / old["min_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        changed = [
+            f"{k} {old[k]:,} -> {new[k]:,}"
+            for k in ("bytes", "elements")
+            if k in old and k in new and old[k] != new[k]
+        ]
+        print(
+            f"{name:<22} {format_time(old['min_s'])} -> "
+            f"{format_time(new['min_s'])} ({ratio:5.2f}x){flag}"
+            + "".join(f"  [{c}]" for c in changed)
+        )
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.bench", description="Benchmark logo generation."
+    )
+    parser.add_argument(
+        "names", nargs="*", metavar="pattern", help="only benchmarks matching these"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON")
+    parser.add_argument(
+        "--compare", type=Path, metavar="BASELINE", help="flag regressions vs JSON"
+    )
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per run")
+    args = parser.parse_args(argv)
+
+    results = run(args.names, args.repeat, args.min_time)
+    if args.output:
+        doc = dict(environment=environment(), results=results)
+        args.output.write_text(json.dumps(doc, indent=1, sort_keys=True))
+        print(f"Saved {args.output}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"\nvs {args.compare}:")
+        regressed = compare(results, baseline["results"], args.threshold)
+        if regressed:
+            print(f"{len(regressed)} regression(s): {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
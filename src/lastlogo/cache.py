@@ -0,0 +1,115 @@
+import functools
+import inspect
+from collections import OrderedDict
+from types import MappingProxyType
+
+import numpy as np
+
+from .profiling import count, span
+
+# Every cache created by memoize(), by qualified function name.
+CACHES = {}
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, build):
+        """Return the value for `key`, calling `build()` on a miss."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            count("memo_misses")
+            value = self._data[key] = build()
+            self._evict()
+            return value
+        self.hits += 1
+        count("memo_hits")
+        self._data.move_to_end(key)
+        return value
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        self._evict()
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._data),
+            maxsize=self.maxsize,
+        )
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def freeze(value):
+    """Make geometry immutable: read-only arrays, tuples, read-only dicts."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    return value
+
+
+def _hashable(value):
+    if isinstance(value, np.ndarray):
+        return (value.shape, value.tobytes())
+    return value
+
+
+def memoize(maxsize=128):
+    """Cache a geometry function on its bound arguments.
+
+    Positional and keyword calls share entries, array arguments (camera
+    matrices) are keyed by value, and results are frozen so callers can't
+    corrupt a shared entry. The cache is exposed as `fn.cache`.
+    """
+
+    def decorator(fn):
+        sig = inspect.signature(fn)
+        cache = CACHES[fn.__qualname__] = LRUCache(maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(_hashable(v) for v in bound.arguments.values())
+
+            def build():
+                with span(fn.__qualname__, "geometry"):
+                    return freeze(fn(*args, **kwargs))
+
+            return cache.get(key, build)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_info():
+    """Hit/miss counters for every memoized function."""
+    return {name: cache.info() for name, cache in CACHES.items()}
+
+
+def resize_caches(maxsize):
+    """Set the LRU bound of every memoized function."""
+    for cache in CACHES.values():
+        cache.resize(maxsize)
@@ -0,0 +1,218 @@
+import argparse
+import importlib
+import sys
+import time
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+
+from . import profiling
+from .backend import BACKENDS
+from .paint import PAINTERS
+
+# CPU time spent starting the interpreter and loading the CLI.
+STARTUP = time.process_time()
+_T0 = time.perf_counter()
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+# Target name → generator module, imported only when the target is built.
+TARGETS = {
+    "icon": "icon",
+    "wordmark": "wordmark",
+    "logo": "logo",
+    "parts": "parts",
+    "favicons": "raster",
+}
+# Targets that rasterize, and so take --painter.
+RASTER_TARGETS = ("favicons",)
+# --painter value that rasterizes the SVG with cairosvg instead of painting.
+CAIROSVG = "cairosvg"
+
+
+def precision(value):
+    """--precision: decimal places, or "full" for one element per primitive."""
+    return None if value == "full" else int(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo", description="Build last.dev logo assets."
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        metavar="target",
+        help=f"any of {', '.join(TARGETS)} (default: all)",
+    )
+    parser.add_argument(
+        "-o",
+        "--out-dir",
+        type=Path,
+        metavar="DEST",
+        help="directory, .zip/.tar/.tar.gz archive, - (one file to stdout),"
+        " or zip:- / tar:- (an archive to stdout)",
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--precision", type=precision, metavar="N|full", default=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="share shapes repeated up to translation via <symbol>/<use>",
+    )
+    parser.add_argument(
+        "--outline",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="draw round-capped wireframes as one filled outline, not strokes",
+    )
+    parser.add_argument(
+        "--painter",
+        choices=(CAIROSVG, *sorted(PAINTERS)),
+        default=CAIROSVG,
+        help="rasterize favicons from the SVG with cairosvg (default), or paint"
+        " them directly; pillow needs no libcairo",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="SPEC",
+        help="render a variant matrix from a JSON/YAML spec instead",
+    )
+    parser.add_argument("-j", "--jobs", type=int, help="batch worker processes")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="stay running: rebuild on save and serve a live preview on :8001",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="artifact cache, shareable between runs (default: .lastlogo-cache)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="neither skip nor record artifacts"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild even up-to-date artifacts"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=profiling.TRACE,
+        metavar="TRACE",
+        help="time each stage and asset; write a Chrome trace"
+        f" (default: {profiling.TRACE}) and print a summary",
+    )
+    args = parser.parse_args(argv)
+    if args.batch and args.targets:
+        parser.error("--batch takes no targets")
+    if args.batch and args.watch:
+        parser.error("--watch can't be combined with --batch")
+    if args.painter != CAIROSVG and args.batch:
+        parser.error("--painter can't be combined with --batch; set it in the spec")
+    if args.painter != CAIROSVG and args.watch:
+        parser.error("--painter can't be combined with --watch")
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+    return args
+
+
+def build(targets, out_dir=OUTPUT_DIR, store=None, force=False, painter=None, **opts):
+    """Build `targets` in this process.
+
+    `out_dir` may be anything sink.open_sink() takes. A `painter` paints the
+    RASTER_TARGETS directly instead of rasterizing their SVG. Returns
+    [(target, import_s, build_s, counts)], counts as returned by
+    incremental.build().
+    """
+    from . import incremental
+    from .sink import open_sink
+
+    sink = open_sink(out_dir)
+    timings = []
+    try:
+        for target in targets:
+            t0 = time.perf_counter()
+            with profiling.span(target, "target"):
+                with profiling.span("import", "import"):
+                    module = importlib.import_module("." + TARGETS[target], __package__)
+                t1 = time.perf_counter()
+                kw = dict(opts, painter=painter) if target in RASTER_TARGETS else opts
+                counts = incremental.build(
+                    module.__name__, module.artifacts(**kw), sink, store, force
+                )
+            timings.append((target, t1 - t0, time.perf_counter() - t1, counts))
+    finally:
+        # Keep what was built even if a later target fails
+        if store is not None:
+            store.save()
+        if sink is not out_dir:
+            sink.close()
+    return timings
+
+
+def report(timings):
+    """Print per-target timings and the cold start of the whole run."""
+    total = time.perf_counter() - _T0
+    print(f"{'startup':<10} {STARTUP * 1e3:7.1f} ms  (interpreter CPU)")
+    for target, imported, built, counts in timings:
+        status = ", ".join(f"{n} {k}" for k, n in counts.items() if n)
+        print(
+            f"{target:<10} {built * 1e3:7.1f} ms  (+{imported * 1e3:.1f} ms import)"
+            f"  {status}"
+        )
+    print(f"{'total':<10} {(STARTUP + total) * 1e3:7.1f} ms  (cold start)")
+
+
+def main(argv=None):
+    args = vars(parse_args(argv))
+    trace = args.pop("profile")
+    if trace:
+        profiling.enable(trace)
+    spec, workers = args.pop("batch"), args.pop("jobs")
+    cache_dir, no_cache = args.pop("cache_dir"), args.pop("no_cache")
+    painter = args.pop("painter")
+    if args.pop("watch"):
+        from . import watch
+
+        targets = args.pop("targets") or [t for t in TARGETS if t != "favicons"]
+        out_dir = args.pop("out_dir")
+        del args["force"]
+        watch.run(targets, args, out_dir)
+        return
+    store = None
+    if not no_cache:
+        from .incremental import CACHE_DIR, Store
+
+        store = Store(cache_dir or CACHE_DIR)
+    targets = args.pop("targets") or list(TARGETS)
+    out_dir = args.pop("out_dir")
+    if out_dir is None and not spec:
+        out_dir = OUTPUT_DIR
+    sink, logs = None, nullcontext()
+    if out_dir is not None:
+        from .sink import open_sink, writes_stdout
+
+        # Opened before stdout is redirected, so stdout sinks get the real one
+        sink = open_sink(out_dir)
+        if writes_stdout(out_dir):
+            # Progress goes to stderr while files stream to stdout
+            logs = redirect_stdout(sys.stderr)
+    try:
+        with logs:
+            if spec:
+                from . import batch
+
+                batch.main(spec, sink, workers, store, args["force"])
+            else:
+                painter = None if painter == CAIROSVG else painter
+                report(build(targets, sink, store=store, painter=painter, **args))
+    finally:
+        if sink is not None:
+            sink.close()
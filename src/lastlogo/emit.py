@@ -0,0 +1,352 @@
+from collections import Counter
+
+import numpy as np
+
+from .outline import TOLERANCE, stroke_outline
+from .profiling import span
+
+# Decimal places kept by the compact emitter.
+PRECISION = 2
+
+# Approximate bytes of one <use> element and of a <symbol> wrapper, used to
+# decide whether sharing a repeated shape pays off.
+USE_BYTES = 40
+SYMBOL_BYTES = 50
+
+# Presentation attributes that only matter on stroked paths.
+STROKE_ONLY = ("stroke_width", "stroke_linecap", "stroke_linejoin")
+
+
+class ElementEmitter:
+    """Write every primitive as its own element, at full precision.
+
+    This is the reference output: one <polygon> per face and one <line>
+    per edge, with the style repeated on each. Canvases that paint
+    directly (see paint.py) always get this emitter.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+    def polygons(self, polys, **style):
+        """Fill one region made of `polys` (N, 2) point arrays."""
+        polys = [np.asarray(p, dtype=float).tolist() for p in polys]
+        if len(polys) == 1:
+            self.canvas.polygon(polys[0], **style)
+        elif polys:
+            self.canvas.region(polys, **style)
+
+    def lines(self, segments, **style):
+        """Stroke each (start, end) pair of `segments`."""
+        for start, end in np.asarray(segments, dtype=float).tolist():
+            self.canvas.line(start, end, **style)
+
+    def begin_shape(self):
+        pass
+
+    def end_shape(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class PathEmitter:
+    """Merge primitives into one <path> per run of identical style.
+
+    Coordinates are quantized to `precision` decimals and written as
+    relative commands; deltas are taken between the quantized integers, so
+    rounding never accumulates. Attributes every path agrees on are hoisted
+    to a parent <g>. The output depends only on the input geometry.
+    """
+
+    def __init__(self, canvas, precision=PRECISION):
+        self.canvas = canvas
+        self.precision = precision
+        self.scale = 10**precision
+        self.runs = []
+
+    def polygons(self, polys, **style):
+        """Fill one region made of `polys` (N, 2) point arrays."""
+        if style.get("stroke") == "none":
+            style = {k: v for k, v in style.items() if k != "stroke"}
+        paths = []
+        for poly in polys:
+            pts = _dedupe(self._quantize(poly))
+            if _area2(pts) < 0:
+                # One winding for every subpath, so overlaps stay filled
+                pts = pts[::-1]
+            paths.append(pts)
+        self._add(style, True, paths)
+
+    def lines(self, segments, **style):
+        """Stroke each (start, end) pair of `segments`."""
+        segments = self._quantize(segments).reshape(-1, 2, 2)
+        self._add({"fill": "none", **style}, False, list(segments))
+
+    def begin_shape(self):
+        """Start a shape: the calls up to end_shape() that draw one object."""
+
+    def end_shape(self):
+        pass
+
+    def close(self):
+        """Write the collected runs to the canvas."""
+        with span(type(self).__name__, "emit"):
+            self._flush()
+
+    def _flush(self):
+        styles = [dict(key) for (key, _), _ in self.runs]
+        shared = _hoist(styles)
+        if shared:
+            self.canvas.begin_group(**shared)
+        for style, ((_, closed), paths) in zip(styles, self.runs):
+            own = {k: v for k, v in style.items() if k not in shared}
+            self.canvas.path(path_data(paths, closed, self.precision), **own)
+        if shared:
+            self.canvas.end_group()
+        self.runs = []
+
+    def _quantize(self, pts):
+        scaled = np.asarray(pts, dtype=float) * self.scale
+        return np.rint(scaled).astype(np.int64)
+
+    def _add(self, style, closed, paths):
+        key = (tuple(sorted(style.items())), closed)
+        if self.runs and self.runs[-1][0] == key:
+            self.runs[-1][1].extend(paths)
+        else:
+            self.runs.append((key, list(paths)))
+
+
+class SymbolEmitter(PathEmitter):
+    """PathEmitter that writes shapes repeated up to translation only once.
+
+    The calls between begin_shape() and end_shape() form one shape; any
+    other call is a shape of its own. A shape that recurs is defined once
+    as a <symbol>, relative to its first point, and drawn with a <use> at
+    each occurrence, if that is smaller. Geometry is quantized relative to
+    that point, so translated copies match whatever their offsets. Shapes
+    that occur once are written exactly as by PathEmitter.
+    """
+
+    def __init__(self, canvas, precision=PRECISION):
+        super().__init__(canvas, precision)
+        self.shapes = []
+        self._shape = None
+
+    def polygons(self, polys, **style):
+        polys = [np.asarray(p, dtype=float) for p in polys]
+        self._record(PathEmitter.polygons, polys, style)
+
+    def lines(self, segments, **style):
+        segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+        self._record(PathEmitter.lines, list(segments), style)
+
+    def begin_shape(self):
+        self._shape = []
+
+    def end_shape(self):
+        if self._shape:
+            self.shapes.append(self._shape)
+        self._shape = None
+
+    def _flush(self):
+        local = [self._local(shape) for shape in self.shapes]
+        counts = Counter(key for _, key in local)
+        symbols = {}
+        for _, key in local:
+            n = counts[key]
+            size = sum(len(d) for _, d in key)
+            if key not in symbols and (n - 1) * size > n * USE_BYTES + SYMBOL_BYTES:
+                symbols[key] = f"s{len(symbols)}"
+
+        for shape, (anchor, key) in zip(self.shapes, local):
+            if key in symbols:
+                self.runs.append((("use", symbols[key]), anchor))
+            else:
+                for method, geometry, style in shape:
+                    method(self, geometry, **style)
+        self.shapes = []
+
+        styles = [dict(key) for (key, _), _ in self.runs if key != "use"]
+        styles += [dict(style) for key in symbols for (style, _), _ in key]
+        shared = _hoist(styles)
+
+        if symbols:
+            self.canvas.begin_defs()
+            for key, name in symbols.items():
+                self.canvas.begin_symbol(name, overflow="visible")
+                for (style, _), d in key:
+                    own = {k: v for k, v in style if k not in shared}
+                    self.canvas.path(d, **own)
+                self.canvas.end_symbol()
+            self.canvas.end_defs()
+        if shared:
+            self.canvas.begin_group(**shared)
+        for (key, closed), paths in self.runs:
+            if key == "use":
+                name, anchor = closed, paths
+                x, y = (fmt(v, self.precision) for v in anchor.tolist())
+                self.canvas.use(f"#{name}", x, y)
+                continue
+            own = {k: v for k, v in key if k not in shared}
+            self.canvas.path(path_data(paths, closed, self.precision), **own)
+        if shared:
+            self.canvas.end_group()
+        self.runs = []
+
+    def _record(self, method, geometry, style):
+        if not geometry:
+            return
+        if self._shape is None:
+            self.shapes.append([(method, geometry, style)])
+        else:
+            self._shape.append((method, geometry, style))
+
+    def _local(self, shape):
+        """(quantized anchor, translation-free key) of a recorded shape.
+
+        The key holds the ((style, closed), path data) of each run the shape
+        draws, relative to its first point.
+        """
+        anchor = shape[0][1][0].reshape(-1, 2)[0]
+        scratch = PathEmitter(None, self.precision)
+        for method, geometry, style in shape:
+            method(scratch, [g - anchor for g in geometry], **style)
+        key = tuple(
+            (run, path_data(paths, run[1], self.precision))
+            for run, paths in scratch.runs
+        )
+        return self._quantize(anchor), key
+
+
+class OutlineEmitter:
+    """Fill round-capped strokes rather than stroke them; pass on the rest.
+
+    Each lines() call with round caps becomes one region of its stroke
+    colour, the union of its strokes (see outline.py): renderers needn't
+    expand strokes, and where strokes meet their caps are filled once.
+    """
+
+    def __init__(self, inner, tolerance=TOLERANCE):
+        self.inner = inner
+        self.tolerance = tolerance
+
+    def polygons(self, polys, **style):
+        self.inner.polygons(polys, **style)
+
+    def lines(self, segments, **style):
+        stroke = style.get("stroke", "none")
+        if stroke == "none" or style.get("stroke_linecap") != "round":
+            self.inner.lines(segments, **style)
+            return
+        width = float(style.get("stroke_width", 1))
+        loops, fill_rule = stroke_outline(segments, width, self.tolerance)
+        fill = {k: v for k, v in style.items() if k not in STROKE_ONLY}
+        fill.update(fill=stroke, stroke="none")
+        if fill_rule != "nonzero":
+            fill["fill_rule"] = fill_rule
+        self.inner.polygons(loops, **fill)
+
+    def begin_shape(self):
+        self.inner.begin_shape()
+
+    def end_shape(self):
+        self.inner.end_shape()
+
+    def close(self):
+        self.inner.close()
+
+
+def emitter(canvas, precision=PRECISION, symbols=False, outline=False):
+    """The compact PathEmitter, or the ElementEmitter when `precision` is None.
+
+    With `symbols`, repeated shapes are shared through <symbol>/<use>; with
+    `outline`, round-capped strokes are drawn as filled outlines.
+    Canvases that paint directly get the ElementEmitter: there is no path
+    data to make compact.
+    """
+    if getattr(canvas, "direct", False):
+        out = ElementEmitter(canvas)
+    elif precision is None:
+        if symbols:
+            raise ValueError("symbols need a precision; full precision writes elements")
+        out = ElementEmitter(canvas)
+    elif symbols:
+        out = SymbolEmitter(canvas, precision)
+    else:
+        out = PathEmitter(canvas, precision)
+    return OutlineEmitter(out) if outline else out
+
+
+def _dedupe(pts):
+    """Drop repeated consecutive points, including a closing duplicate."""
+    keep = np.any(pts != np.roll(pts, 1, axis=0), axis=1)
+    keep[0] = True
+    return pts[keep] if len(pts) > 1 else pts
+
+
+def _area2(pts):
+    x, y = pts[:, 0], pts[:, 1]
+    return int(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+
+def _hoist(styles):
+    """Attributes to move from every path onto the parent group.
+
+    Stroke-only attributes may also be hoisted when the paths lacking them
+    are not stroked at all.
+    """
+    shared = {}
+    for name in sorted({k for style in styles for k in style}):
+        values = {style[name] for style in styles if name in style}
+        if len(values) != 1:
+            continue
+        missing = [style for style in styles if name not in style]
+        if not missing or (
+            name in STROKE_ONLY
+            and all(style.get("stroke", "none") == "none" for style in missing)
+        ):
+            shared[name] = values.pop()
+    return shared
+
+
+def fmt(value, precision):
+    """Format an integer count of 10**-precision units, without padding."""
+    sign = "-" if value < 0 else ""
+    whole, frac = divmod(abs(value), 10**precision)
+    frac = str(frac).rjust(precision, "0").rstrip("0") if precision else ""
+    if not frac:
+        return f"{sign}{whole}"
+    return f"{sign}{whole or ''}.{frac}"
+
+
+def _numbers(values, precision):
+    return " ".join(fmt(v, precision) for v in values)
+
+
+def path_data(paths, closed, precision=PRECISION):
+    """Relative path data for quantized (N, 2) integer point arrays.
+
+    The first subpath starts with an absolute moveto; every later one moves
+    relative to where the previous one ended, and its points follow as
+    implicit relative linetos.
+    """
+    d = []
+    current = None
+    for pts in paths:
+        start = pts[0]
+        deltas = np.diff(pts, axis=0).ravel().tolist()
+        if current is None:
+            d.append("M" + _numbers(start.tolist(), precision))
+            if deltas:
+                d.append("l" + _numbers(deltas, precision))
+        else:
+            d.append("m" + _numbers((start - current).tolist() + deltas, precision))
+        if closed:
+            d.append("z")
+            current = start
+        else:
+            current = pts[-1]
+    return "".join(d)
@@ -0,0 +1,114 @@
+import math
+
+from .projection import ANG
+
+# Glyphs are built from axis-aligned bars on a grid in the x–z plane.
+# Column lines, left to right: 0, bw, the centred stem (2, 3), w - bw, w.
+# Row lines, bottom to top: 0, bw, the middle bar (2, 3), h - bw, h.
+#
+# The gaps beside the centred stem are too narrow to survive the outline, so
+# letters read on three columns: N steps down from its top-left corner, M and
+# W fill the upper and lower middle, and V narrows to the centred stem.
+#
+# Each glyph lists (col0, row0, col1, row1) bars back to front: a bar comes
+# after every bar it can hide, i.e. after bars to its right on the same rows
+# and bars below it in the same columns.
+GLYPHS = {
+    "A": ((4, 0, 5, 5), (0, 4, 5, 5), (0, 2, 5, 3), (0, 0, 1, 5)),
+    "B": (
+        (0, 0, 4, 1),
+        (4, 1, 5, 2),
+        (0, 1, 1, 2),
+        (0, 2, 4, 3),
+        (4, 3, 5, 4),
+        (0, 3, 1, 4),
+        (0, 4, 4, 5),
+    ),
+    "C": ((0, 0, 5, 1), (0, 1, 1, 4), (0, 4, 5, 5)),
+    "D": ((0, 0, 4, 1), (4, 1, 5, 4), (0, 1, 1, 4), (0, 4, 4, 5)),
+    "E": ((0, 0, 5, 1), (0, 1, 1, 2), (0, 2, 4, 3), (0, 3, 1, 4), (0, 4, 5, 5)),
+    "F": ((0, 0, 1, 2), (0, 2, 4, 3), (0, 3, 1, 4), (0, 4, 5, 5)),
+    "G": ((0, 0, 5, 1), (4, 1, 5, 2), (2, 2, 5, 3), (0, 1, 1, 4), (0, 4, 5, 5)),
+    "H": ((4, 0, 5, 5), (1, 2, 4, 3), (0, 0, 1, 5)),
+    "I": ((0, 0, 5, 1), (2, 1, 3, 4), (0, 4, 5, 5)),
+    "J": ((0, 0, 5, 1), (4, 1, 5, 5), (0, 1, 1, 2)),
+    "K": ((4, 0, 5, 2), (4, 3, 5, 5), (1, 2, 4, 3), (0, 0, 1, 5)),
+    "L": ((0, 0, 5, 1), (0, 1, 1, 5)),
+    "M": ((4, 0, 5, 5), (1, 2, 4, 4), (0, 0, 1, 5)),
+    "N": ((4, 0, 5, 4), (0, 0, 1, 4), (0, 4, 3, 5)),
+    "O": ((0, 0, 5, 1), (4, 1, 5, 4), (0, 1, 1, 4), (0, 4, 5, 5)),
+    "P": ((0, 0, 1, 2), (0, 2, 5, 3), (4, 3, 5, 4), (0, 3, 1, 4), (0, 4, 5, 5)),
+    "Q": ((0, 0, 5, 1), (4, 1, 5, 4), (2, 1, 3, 2), (0, 1, 1, 4), (0, 4, 5, 5)),
+    "R": (
+        (4, 0, 5, 2),
+        (0, 0, 1, 2),
+        (0, 2, 5, 3),
+        (4, 3, 5, 4),
+        (0, 3, 1, 4),
+        (0, 4, 5, 5),
+    ),
+    "S": ((0, 0, 5, 1), (4, 1, 5, 2), (0, 2, 5, 3), (0, 3, 1, 4), (0, 4, 5, 5)),
+    "T": ((2, 0, 3, 4), (0, 4, 5, 5)),
+    "U": ((0, 0, 5, 1), (4, 1, 5, 5), (0, 1, 1, 5)),
+    "V": ((4, 1, 5, 5), (2, 0, 3, 1), (0, 1, 1, 5)),
+    "W": ((4, 0, 5, 5), (1, 1, 4, 3), (0, 0, 1, 5)),
+    "X": ((4, 0, 5, 2), (0, 0, 1, 2), (1, 2, 4, 3), (4, 3, 5, 5), (0, 3, 1, 5)),
+    "Y": ((2, 0, 3, 2), (0, 2, 5, 3), (4, 3, 5, 5), (0, 3, 1, 5)),
+    "Z": ((0, 0, 5, 1), (0, 1, 2, 2), (1, 2, 4, 3), (3, 3, 5, 4), (0, 4, 5, 5)),
+    "0": ((0, 0, 5, 1), (4, 1, 5, 4), (2, 2, 3, 3), (0, 1, 1, 4), (0, 4, 5, 5)),
+    "1": ((0, 0, 5, 1), (2, 1, 3, 5), (0, 4, 2, 5)),
+    "2": ((0, 0, 5, 1), (0, 1, 1, 2), (0, 2, 5, 3), (4, 3, 5, 4), (0, 4, 5, 5)),
+    "3": ((4, 0, 5, 5), (0, 0, 4, 1), (1, 2, 4, 3), (0, 4, 4, 5)),
+    "4": ((4, 0, 5, 5), (0, 2, 4, 3), (0, 3, 1, 5)),
+    "5": ((0, 0, 5, 1), (4, 1, 5, 3), (0, 2, 4, 3), (1, 4, 5, 5), (0, 3, 1, 5)),
+    "6": ((0, 0, 5, 1), (4, 1, 5, 2), (1, 2, 5, 3), (1, 4, 5, 5), (0, 1, 1, 5)),
+    "7": ((4, 0, 5, 4), (0, 4, 5, 5)),
+    "8": (
+        (0, 0, 5, 1),
+        (4, 1, 5, 2),
+        (0, 1, 1, 2),
+        (0, 2, 5, 3),
+        (4, 3, 5, 4),
+        (0, 3, 1, 4),
+        (0, 4, 5, 5),
+    ),
+    "9": ((4, 0, 5, 4), (0, 0, 4, 1), (0, 2, 4, 3), (0, 3, 1, 4), (0, 4, 5, 5)),
+    "-": ((1, 2, 4, 3),),
+    ".": ((0, 0, 1, 1),),
+    " ": (),
+}
+
+
+def grid(w, h, bw):
+    """Column and row lines of the glyph grid for a w x h cell."""
+    c0 = w / 2 - bw / 2
+    mid = h / 2 - bw / 2
+    return (0, bw, c0, c0 + bw, w - bw, w), (0, bw, mid, mid + bw, h - bw, h)
+
+
+def glyph_rects(char, w, h, bw):
+    """(x0, z0, x1, z1) of each bar of `char` in its local cell.
+
+    A stem that alone reaches the top or bottom of the glyph is extended so
+    its corner projects level with a full-width bar: the x axis rises at
+    ANG, so a stem short of the right edge would otherwise look too low,
+    and one away from the left edge would stop short of the baseline.
+    """
+    try:
+        cells = GLYPHS[char]
+    except KeyError:
+        raise ValueError(f"no glyph for {char!r}") from None
+    cols, rows = grid(w, h, bw)
+    rects = [(cols[c0], rows[r0], cols[c1], rows[r1]) for c0, r0, c1, r1 in cells]
+    s = math.sin(ANG)
+    if rects and not any(z1 == h and x1 == w for _, _, x1, z1 in rects):
+        rects = [
+            (x0, z0, x1, h + s * (w - x1) if z1 == h and x1 - x0 <= bw else z1)
+            for x0, z0, x1, z1 in rects
+        ]
+    if rects and not any(z0 == 0 and x0 == 0 for x0, z0, _, _ in rects):
+        rects = [
+            (x0, -s * x0 if z0 == 0 and x1 - x0 <= bw else z0, x1, z1)
+            for x0, z0, x1, z1 in rects
+        ]
+    return rects
@@ -0,0 +1,205 @@
+import argparse
+import importlib
+import io
+import json
+import sys
+import time
+from fnmatch import fnmatch
+from functools import partial
+from pathlib import Path
+
+from .batch import ASSETS, svg_artifacts
+from .paint import PAINTERS, paint_image
+from .template import THEMES
+
+GOLDEN_DIR = Path(__file__).resolve().parents[2] / "golden"
+DIFF_DIR = GOLDEN_DIR / "diff"
+BUDGETS = GOLDEN_DIR / "budgets.json"
+
+# A pixel differs when any RGBA channel moves by more than TOLERANCE; a
+# render fails when more than MAX_DIFF of its pixels differ.
+TOLERANCE = 8
+MAX_DIFF = 0.001
+# Rasterizations per asset; the fastest is compared with its time budget.
+REPEAT = 3
+# Generator options whose SVGs are checked as well as the defaults, each
+# under its own directory.
+VARIANTS = {"symbols": dict(symbols=True), "outline": dict(outline=True)}
+
+
+def outputs():
+    """Yield (name, source) for every output with a golden.
+
+    `source` is SVG bytes, rasterized by render_svg(), or a function
+    returning the RGBA image of an asset painted directly (see paint.py).
+    Names other than the default SVGs start with their variant or painter,
+    e.g. "outline/icon-light.svg" or "pillow/icon-light.png".
+    """
+    yield from svg_artifacts()
+    for variant, opts in VARIANTS.items():
+        for name, svg in svg_artifacts(**opts):
+            yield f"{variant}/{name}", svg
+    for painter in PAINTERS:
+        for asset in ASSETS:
+            module = importlib.import_module("." + asset, __package__)
+            drawing = getattr(module, f"{asset}_drawing")
+            for theme, colours in THEMES.items():
+                paint = partial(paint_image, drawing, painter=painter, **colours)
+                yield f"{painter}/{asset}-{theme}.png", paint
+
+
+def render_svg(svg):
+    """Rasterize SVG bytes at their own size to an RGBA Pillow image.
+
+    Goldens use resvg, pinned by the "golden" extra, rather than cairosvg:
+    its output doesn't depend on the system's cairo library.
+    """
+    import resvg_py
+    from PIL import Image
+
+    png = resvg_py.svg_to_bytes(svg_string=svg.decode())
+    return Image.open(io.BytesIO(bytes(png))).convert("RGBA")
+
+
+def load_budgets(path=BUDGETS):
+    """[(filename pattern, {"bytes": n, "raster_ms": t})], first match wins."""
+    if not path.exists():
+        return []
+    return list(json.loads(path.read_text()).items())
+
+
+def budget_for(name, budgets):
+    for pattern, budget in budgets:
+        if fnmatch(name, pattern):
+            return budget
+    return {}
+
+
+def diff(golden, actual, tolerance=TOLERANCE):
+    """Return (fraction of differing pixels, diff image or None).
+
+    The diff image is the golden in faint grey with every differing pixel
+    in red.
+    """
+    from PIL import Image, ImageChops
+
+    if golden.size != actual.size:
+        return 1.0, None
+    delta = ImageChops.difference(golden, actual).split()
+    mask = delta[0]
+    for band in delta[1:]:
+        mask = ImageChops.lighter(mask, band)
+    mask = mask.point(lambda v: 255 if v > tolerance else 0)
+    changed = mask.histogram()[255]
+    if not changed:
+        return 0.0, None
+    base = golden.convert("L").point(lambda v: 192 + v // 4).convert("RGB")
+    red = Image.new("RGB", golden.size, (255, 0, 0))
+    return changed / (golden.width * golden.height), Image.composite(red, base, mask)
+
+
+def check(name, source, budgets, update=False, tolerance=TOLERANCE, max_diff=MAX_DIFF):
+    """Rasterize `name` and check it against its golden PNG and budgets.
+
+    `source` is as yielded by outputs(). A missing golden is a failure;
+    goldens are only written with `update`. Returns a list of failure
+    messages (empty when it passes), or None when `name` can't be
+    rasterized here.
+    """
+    rasterize = source if callable(source) else partial(render_svg, source)
+    times = []
+    try:
+        for _ in range(REPEAT):
+            t0 = time.perf_counter()
+            actual = rasterize()
+            times.append(time.perf_counter() - t0)
+    except (ImportError, OSError) as e:
+        # e.g. resvg_py, or the cairo library the Cairo painter loads
+        print(f"skip {name:<28} ({str(e).splitlines()[0]})")
+        return None
+    raster_ms = min(times) * 1e3
+
+    failures = []
+    budget = budget_for(name, budgets)
+    size = len(source) if isinstance(source, bytes) else None
+    if size is not None and "bytes" in budget and size > budget["bytes"]:
+        failures.append(f"{size:,} bytes > budget {budget['bytes']:,}")
+    if "raster_ms" in budget and raster_ms > budget["raster_ms"]:
+        failures.append(f"raster {raster_ms:.1f} ms > budget {budget['raster_ms']} ms")
+
+    golden_path = GOLDEN_DIR / Path(name).with_suffix(".png")
+    stem = DIFF_DIR / Path(name).with_suffix("")
+    if update:
+        golden_path.parent.mkdir(parents=True, exist_ok=True)
+        actual.save(golden_path)
+        status = "updated"
+    elif not golden_path.exists():
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        actual.save(f"{stem}-actual.png")
+        status = "no golden"
+        failures.append(f"no {golden_path.relative_to(GOLDEN_DIR)}; run with --update")
+    else:
+        from PIL import Image
+
+        with Image.open(golden_path) as im:
+            golden = im.convert("RGBA")
+        fraction, image = diff(golden, actual, tolerance)
+        status = f"{fraction:.4%} differ"
+        if fraction > max_diff:
+            stem.parent.mkdir(parents=True, exist_ok=True)
+            actual.save(f"{stem}-actual.png")
+            if image is None:
+                failures.append(f"size {actual.size} != golden {golden.size}")
+            else:
+                image.save(f"{stem}-diff.png")
+                failures.append(f"{fraction:.2%} of pixels differ")
+    print(
+        f"{'FAIL' if failures else 'ok':<4} {name:<28}"
+        f" {f'{size:,} B' if size is not None else '-':>9}"
+        f" {raster_ms:7.1f} ms  {status}"
+    )
+    for failure in failures:
+        print(f"       {failure}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.golden",
+        description="Check generated assets against golden rasters and budgets.",
+    )
+    parser.add_argument(
+        "names", nargs="*", metavar="pattern", help="only files matching these globs"
+    )
+    parser.add_argument("--update", action="store_true", help="write the golden PNGs")
+    parser.add_argument("--tolerance", type=int, default=TOLERANCE)
+    parser.add_argument("--max-diff", type=float, default=MAX_DIFF)
+    parser.add_argument(
+        "--allow-skip",
+        action="store_true",
+        help="pass even if some outputs can't be rendered here",
+    )
+    args = parser.parse_args(argv)
+
+    budgets = load_budgets()
+    failed, skipped = [], []
+    for name, source in outputs():
+        if args.names and not any(fnmatch(name, p) for p in args.names):
+            continue
+        result = check(
+            name, source, budgets, args.update, args.tolerance, args.max_diff
+        )
+        if result is None:
+            skipped.append(name)
+        elif result:
+            failed.append(name)
+    if skipped:
+        print(f"{len(skipped)} skipped: no renderer for them here")
+    if failed:
+        print(f"{len(failed)} failed; diff images in {DIFF_DIR}")
+    if failed or (skipped and not args.allow_skip):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
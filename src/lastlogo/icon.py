@@ -0,0 +1,195 @@
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from .backend import BACKEND, open_canvas
+from .cache import memoize
+from .emit import PRECISION, emitter
+from .incremental import build
+from .projection import CORNERS, ISO, box, project
+from .template import THEMES, compile_template
+from .voxels import PARTS, SIDES, cube_grid, edges, faces
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+SIDE = 100
+ACCENT = "#5A9EA3"
+
+
+@memoize()
+def cube_verts(s, cam=ISO):
+    """Return named vertices of the isometric cube."""
+    return dict(zip(CORNERS, box(0, 0, 0, s, s, s, cam)))
+
+
+def cube_hexagon(v):
+    """The 6 outer vertices forming the cube silhouette (a hexagon)."""
+    return np.array([v["btr"], v["ftr"], v["fbr"], v["fbl"], v["bbl"], v["btl"]])
+
+
+@memoize()
+def cube_extent(s, cam=ISO):
+    """Unpadded (x_min, y_min, x_max, y_max) of the cube silhouette."""
+    hexagon = cube_hexagon(cube_verts(s, cam))
+    return (*hexagon.min(axis=0).tolist(), *hexagon.max(axis=0).tolist())
+
+
+@memoize()
+def cube_wireframe(s, cam=ISO):
+    """The visible edges of the voxel cube (see voxels.py) as an (E, 2, 2) array."""
+    grid = cube_grid()
+    segments = edges(grid, cam) * (s / len(grid))
+    return project(segments.reshape(-1, 3), cam).reshape(-1, 2, 2)
+
+
+@memoize()
+def part_faces(s):
+    """Model-space polygons of each part on the sides the icon shows.
+
+    Maps part name to its (top, left, right) polygons, merged from the
+    voxel cube's faces; parts go from the front (teal) to the back (white).
+    """
+    grid = cube_grid()
+    sides = {(PARTS[colour - 1], side): poly for poly, colour, side in faces(grid)}
+    unit = s / len(grid)
+    return {part: [sides[part, side] * unit for side in SIDES] for part in PARTS}
+
+
+def l_faces(s):
+    """The L in model space: its (top, left, right) face polygons.
+
+    The L runs the full length of the cube on each face — edge to edge
+    on both the top and right faces, connected by the L-shaped elbow
+    on the left face.
+    """
+    return list(part_faces(s)["black"])
+
+
+def notch_faces(s):
+    """The notch above the L in model space: its (top, left, right) regions."""
+    return list(part_faces(s)["teal"])
+
+
+@memoize()
+def l_shape(s, cam=ISO):
+    """Build the L as 3 face polygons, one per visible cube face."""
+    return [project(face, cam) for face in l_faces(s)]
+
+
+@memoize()
+def notch(s, cam=ISO):
+    """The 3 coloured regions filling the notch above the L."""
+    return [project(face, cam) for face in notch_faces(s)]
+
+
+def draw_cube(out, cx, cy, fg="black", bg="white", accent=ACCENT):
+    """Draw the cube icon shifted by (cx, cy) through emitter `out`."""
+    v = cube_verts(SIDE)
+    hexagon = cube_hexagon(v)
+    wireframe = cube_wireframe(SIDE)
+
+    def shift(pts):
+        return pts + (cx, cy)
+
+    out.begin_shape()
+    # Filled cube background
+    out.polygons([shift(hexagon)], fill=bg, stroke="none")
+
+    # Colored regions
+    for region in notch(SIDE):
+        out.polygons([shift(region)], fill=accent, stroke="none")
+
+    # L shape faces
+    for face in l_shape(SIDE):
+        out.polygons([shift(face)], fill=fg, stroke="none")
+
+    # Wireframe
+    out.lines(shift(wireframe), stroke=fg, stroke_width=6, stroke_linecap="round")
+    out.end_shape()
+
+
+def icon_drawing(
+    stream,
+    fg="black",
+    bg="white",
+    accent=ACCENT,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    outline=False,
+):
+    """Draw the standalone icon to `stream` and return its (width, height)."""
+    pad = 6 / 2  # half of wireframe stroke_width
+    x_min, y_min, x_max, y_max = cube_extent(SIDE)
+    w = x_max - x_min + 6
+    h = y_max - y_min + 6
+
+    canvas = open_canvas(stream, (w, h), backend)
+    out = emitter(canvas, precision, symbols, outline)
+    draw_cube(out, -x_min + pad, -y_min + pad, fg=fg, bg=bg, accent=accent)
+    out.close()
+    canvas.close()
+    return canvas.size
+
+
+@memoize()
+def icon_template(precision=PRECISION, backend=BACKEND, symbols=False, outline=False):
+    """The icon compiled once into a colour-slot Template."""
+    return compile_template(
+        partial(
+            icon_drawing,
+            precision=precision,
+            backend=backend,
+            symbols=symbols,
+            outline=outline,
+        )
+    )
+
+
+def draw_icon(
+    filename,
+    fg="black",
+    bg="white",
+    accent=ACCENT,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    outline=False,
+):
+    tpl = icon_template(precision, backend, symbols, outline)
+    Path(filename).write_bytes(tpl.render(fg=fg, bg=bg, accent=accent))
+    print(f"Saved {filename} ({tpl.size[0]:.0f}x{tpl.size[1]:.0f})")
+
+
+def artifacts(precision=PRECISION, backend=BACKEND, symbols=False, outline=False):
+    """(filenames, params, render) for each file main() writes."""
+    for theme, colours in THEMES.items():
+
+        def render(colours=colours):
+            return [
+                icon_template(precision, backend, symbols, outline).render(**colours)
+            ]
+
+        params = dict(
+            colours=colours,
+            precision=precision,
+            backend=backend,
+            symbols=symbols,
+            outline=outline,
+        )
+        yield (f"icon-{theme}.svg",), params, render
+
+
+def main(
+    out_dir=OUTPUT_DIR,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    outline=False,
+):
+    build(__name__, artifacts(precision, backend, symbols, outline), out_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from .cache import memoize
+from .profiling import count, span
+from .sink import DirSink, open_sink
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = PACKAGE_DIR.parents[1] / ".lastlogo-cache"
+
+# Bump when the manifest layout changes.
+MANIFEST_VERSION = 1
+
+
+def package_imports(module):
+    """Package modules that `module` imports directly, anywhere in its source."""
+    tree = ast.parse((PACKAGE_DIR / f"{module}.py").read_text())
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            names = [node.module] if node.module else [a.name for a in node.names]
+            found.update(n for n in names if (PACKAGE_DIR / f"{n}.py").exists())
+    return found
+
+
+def _package_deps(module, seen=None):
+    """`module` and every package module it imports, transitively."""
+    seen = set() if seen is None else seen
+    if module in seen:
+        return seen
+    seen.add(module)
+    for name in package_imports(module):
+        _package_deps(name, seen)
+    return seen
+
+
+@memoize()
+def source_hash(modules):
+    """Hash of the source of `modules` and the package modules they import."""
+    if isinstance(modules, str):
+        modules = (modules,)
+    deps = set()
+    for module in modules:
+        _package_deps(module, deps)
+    h = hashlib.sha256()
+    for name in sorted(deps):
+        h.update(name.encode() + b"\0")
+        h.update((PACKAGE_DIR / f"{name}.py").read_bytes())
+    return h.hexdigest()
+
+
+def fingerprint(modules, names, params):
+    """Identity of one artifact: its generator source, files and parameters.
+
+    `modules` is a module name or a tuple of them (e.g. asset and raster).
+    """
+    key = dict(source=source_hash(modules), names=list(names), params=params)
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path):
+    try:
+        return _digest(Path(path).read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+class Store:
+    """Content-addressed artifact cache with a fingerprint manifest.
+
+    objects/ holds every rendered file under the hash of its bytes, and
+    manifest.json maps each fingerprint to the hashes of the files it
+    produced. Nothing in it depends on the output directory, so one
+    cache directory can be shared between checkouts and CI runs.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.dir = Path(cache_dir)
+        self.path = self.dir / "manifest.json"
+        self.entries = self._read()
+
+    def _read(self):
+        if not self.path.exists():
+            return {}
+        manifest = json.loads(self.path.read_text())
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest["entries"]
+
+    def _object(self, digest):
+        return self.dir / "objects" / digest[:2] / digest
+
+    def put(self, data):
+        """Store `data`; return its content hash."""
+        digest = _digest(data)
+        path = self._object(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return digest
+
+    def record(self, key, files):
+        """Remember that fingerprint `key` produced {name: content hash}."""
+        self.entries[key] = files
+
+    def check(self, key, out_dir):
+        """ "fresh", "restored" or None (must render) for fingerprint `key`.
+
+        Files already in `out_dir` with the recorded content are left
+        alone; missing or stale ones are copied back from the object store.
+        """
+        files = self.entries.get(key)
+        if files is None:
+            return None
+        stale = {
+            name: digest
+            for name, digest in files.items()
+            if _file_digest(Path(out_dir) / name) != digest
+        }
+        if not stale:
+            return "fresh"
+        if not all(self._object(digest).exists() for digest in stale.values()):
+            return None
+        for name, digest in stale.items():
+            shutil.copyfile(self._object(digest), Path(out_dir) / name)
+        return "restored"
+
+    def load(self, key):
+        """{name: bytes} recorded for fingerprint `key`, or None if any is gone."""
+        files = self.entries.get(key)
+        if files is None:
+            return None
+        try:
+            return {name: self._object(d).read_bytes() for name, d in files.items()}
+        except FileNotFoundError:
+            return None
+
+    def restore(self, key, sink):
+        """Like check(), for any sink; archives get the stored files again."""
+        if isinstance(sink, DirSink):
+            return self.check(key, sink.dir)
+        files = self.load(key)
+        if files is None:
+            return None
+        for name, data in files.items():
+            sink.write(name, data)
+        return "restored"
+
+    def save(self):
+        """Merge this run's entries into the manifest on disk.
+
+        Runs sharing the cache may save concurrently: the manifest is
+        re-read and rewritten under an exclusive lock on manifest.lock, and
+        replaced atomically, so each run's entries survive.
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.dir / "manifest.lock", "w") as lock:
+            try:
+                import fcntl
+            except ImportError:  # Windows: replace without locking
+                fcntl = None
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self.entries = {**self._read(), **self.entries}
+            manifest = dict(version=MANIFEST_VERSION, entries=self.entries)
+            tmp = self.path.with_name(f"manifest.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+            os.replace(tmp, self.path)
+
+
+def build(module, artifacts, out_dir, store=None, force=False):
+    """Write `artifacts` of generator `module` to `out_dir`.
+
+    `out_dir` may also be an archive path or a sink (see sink.open_sink());
+    each file is handed to it as soon as it is rendered.
+
+    artifacts: (filenames, params, render) triples, where render() returns
+      the bytes of each file. params must be JSON-serializable.
+
+    With a Store, an artifact whose fingerprint matches is skipped (or
+    restored from the store) instead of rendered, unless `force`.
+    Returns {"built": n, "restored": n, "fresh": n}.
+    """
+    module = module.rpartition(".")[2]
+    sink = open_sink(out_dir)
+    counts = dict(built=0, restored=0, fresh=0)
+    try:
+        for names, params, render in artifacts:
+            with span(names[0], "asset", module=module):
+                status = _build_one(module, names, params, render, sink, store, force)
+            counts[status] += 1
+    finally:
+        if sink is not out_dir:
+            sink.close()
+    return counts
+
+
+def _build_one(module, names, params, render, sink, store, force):
+    key = None
+    status = None
+    if store is not None:
+        with span("check", "cache"):
+            key = fingerprint(module, names, params)
+            status = None if force else store.restore(key, sink)
+    if status is None:
+        with span("render", "render"):
+            data = render()
+        if len(data) != len(names):
+            # zip() would pair the files with the wrong names
+            raise ValueError(
+                f"{module}: {len(data)} files rendered for {len(names)} names"
+            )
+        for name, content in zip(names, data):
+            sink.write(name, content)
+            print(f"Saved {name} ({len(content):,} bytes)")
+        if store is not None:
+            with span("store", "cache"):
+                store.record(key, {n: store.put(d) for n, d in zip(names, data)})
+        status = "built"
+    elif status == "restored":
+        print(f"Restored {', '.join(names)}")
+    count(f"artifacts_{status}")
+    return status
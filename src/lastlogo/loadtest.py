@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from urllib.parse import urlsplit
+
+# Request mix: a few hot variants plus cold random colours and sizes.
+PATHS = (
+    "/logo.svg",
+    "/logo.svg?theme=dark",
+    "/icon.svg?theme=dark",
+    "/wordmark.svg",
+    "/icon.png?size=64",
+    "/icon.png?theme=dark&size=192",
+    "/logo.webp?size=256",
+    "/icon.ico",
+)
+
+
+def random_path(rng):
+    if rng.random() < 0.9:
+        return rng.choice(PATHS)
+    asset = rng.choice(("icon", "wordmark", "logo"))
+    accent = f"%23{rng.randrange(1 << 24):06x}"
+    return f"/{asset}.svg?accent={accent}"
+
+
+async def read_response(reader):
+    """Read one response; return (status, ETag or None)."""
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("etag")
+
+
+async def client(host, port, deadline, count, rng, etags, latencies, statuses):
+    """One keep-alive connection issuing requests back to back.
+
+    With an `etags` dict, half the repeat requests revalidate the ETag
+    seen for their path, like a browser cache would.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline and len(latencies) < count:
+            path = random_path(rng)
+            head = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if etags and path in etags and rng.random() < 0.5:
+                head += f"If-None-Match: {etags[path]}\r\n"
+            t0 = time.perf_counter()
+            writer.write((head + "\r\n").encode())
+            status, etag = await read_response(reader)
+            if etags is not None and etag:
+                etags[path] = etag
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency, count, duration, etags, seed):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies, statuses = [], {}
+    rng = random.Random(seed)
+    etags = {} if etags else None
+    deadline = time.perf_counter() + duration
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(host, port, deadline, count, rng, etags, latencies, statuses)
+            for _ in range(concurrency)
+        )
+    )
+    return latencies, statuses, time.perf_counter() - t0
+
+
+def report(latencies, statuses, wall):
+    ms = sorted(t * 1e3 for t in latencies)
+    q = statistics.quantiles(ms, n=100, method="inclusive")
+    print(
+        f"{len(ms)} requests in {wall:.2f} s ({len(ms) / wall:,.0f} req/s); "
+        + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items()))
+    )
+    print(
+        f"p50 {q[49]:.2f} ms  p90 {q[89]:.2f} ms  p99 {q[98]:.2f} ms"
+        f"  max {ms[-1]:.2f} ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.loadtest", description="Load-test a running lastlogo.server."
+    )
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:8000")
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-n", "--requests", type=int, default=5000)
+    parser.add_argument("-d", "--duration", type=float, default=30, help="seconds")
+    parser.add_argument(
+        "--etags",
+        action="store_true",
+        help="revalidate seen ETags on half the repeat requests",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report(
+        *asyncio.run(
+            run(
+                args.url,
+                args.concurrency,
+                args.requests,
+                args.duration,
+                args.etags,
+                args.seed,
+            )
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from functools import partial
+from pathlib import Path
+
+from .backend import BACKEND, open_canvas
+from .cache import memoize
+from .emit import PRECISION, emitter
+from .icon import ACCENT, SIDE, cube_extent, draw_cube
+from .incremental import build
+from .template import THEMES, compile_template
+from .wordmark import STROKE_W, TEXT, draw_text, text_extent
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+
+def get_cube_bounds():
+    """Bounding box (x_min, y_min, x_max, y_max) of the cube."""
+    pad = 6 / 2  # half of wireframe stroke_width
+    x_min, y_min, x_max, y_max = cube_extent(SIDE)
+    return x_min - pad, y_min - pad, x_max + pad, y_max + pad
+
+
+def get_text_bounds(**text_kw):
+    """Bounding box (x_min, y_min, x_max, y_max) of the text."""
+    pad = STROKE_W / 2 + 1
+    x_min, y_min, x_max, y_max = text_extent(**text_kw)
+    return x_min - pad, y_min - pad, x_max + pad, y_max + pad
+
+
+def logo_drawing(
+    stream,
+    fg="black",
+    bg="white",
+    accent=ACCENT,
+    precision=PRECISION,
+    backend=BACKEND,
+    text=TEXT,
+    symbols=False,
+    outline=False,
+):
+    """Draw the icon + `text` lockup to `stream` and return its size."""
+    # Cube geometry height (no padding)
+    _, y_min, _, y_max = cube_extent(SIDE)
+    cube_geo_h = y_max - y_min
+
+    # Default text geometry height (no padding); other texts keep its scale
+    _, y_min, _, y_max = text_extent()
+    text_geo_h = y_max - y_min
+
+    # Scale text params so letter height matches cube height
+    scale = cube_geo_h / text_geo_h
+    text_kw = dict(
+        w=50 * scale, h=70 * scale, bw=15 * scale, gap=25 * scale, d=15 * scale
+    )
+
+    cb = get_cube_bounds()
+    tb = get_text_bounds(text=text, **text_kw)
+
+    cube_w = cb[2] - cb[0]
+    cube_h = cb[3] - cb[1]
+    text_w = tb[2] - tb[0]
+    text_h = tb[3] - tb[1]
+
+    gap = 30
+    total_w = cube_w + gap + text_w
+    max_h = max(cube_h, text_h)
+
+    # Shared offsets
+    cube_cx = -cb[0]
+    cube_cy = -cb[1] + (max_h - cube_h) / 2
+    text_cx = cube_w + gap - tb[0]
+    text_cy = -tb[1] + (max_h - text_h) / 2
+
+    canvas = open_canvas(stream, (total_w, max_h), backend)
+    out = emitter(canvas, precision, symbols, outline)
+    draw_cube(out, cube_cx, cube_cy, fg=fg, bg=bg, accent=accent)
+    draw_text(out, text_cx, text_cy, fg=fg, bg=bg, text=text, **text_kw)
+    out.close()
+    canvas.close()
+    return canvas.size
+
+
+@memoize()
+def logo_template(
+    precision=PRECISION, backend=BACKEND, text=TEXT, symbols=False, outline=False
+):
+    """The logo for `text` compiled once into a colour-slot Template."""
+    return compile_template(
+        partial(
+            logo_drawing,
+            precision=precision,
+            backend=backend,
+            text=text,
+            symbols=symbols,
+            outline=outline,
+        )
+    )
+
+
+def draw_logo(
+    filename,
+    fg="black",
+    bg="white",
+    accent=ACCENT,
+    precision=PRECISION,
+    backend=BACKEND,
+    text=TEXT,
+    symbols=False,
+    outline=False,
+):
+    tpl = logo_template(precision, backend, text, symbols, outline)
+    Path(filename).write_bytes(tpl.render(fg=fg, bg=bg, accent=accent))
+    print(f"Saved {filename} ({tpl.size[0]:.0f}x{tpl.size[1]:.0f})")
+
+
+def artifacts(precision=PRECISION, backend=BACKEND, symbols=False, outline=False):
+    """(filenames, params, render) for each file main() writes."""
+    for theme, colours in THEMES.items():
+
+        def render(colours=colours):
+            tpl = logo_template(precision, backend, symbols=symbols, outline=outline)
+            return [tpl.render(**colours)]
+
+        params = dict(
+            colours=colours,
+            precision=precision,
+            backend=backend,
+            symbols=symbols,
+            outline=outline,
+        )
+        yield (f"logo-{theme}.svg",), params, render
+
+
+def main(
+    out_dir=OUTPUT_DIR,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    outline=False,
+):
+    build(__name__, artifacts(precision, backend, symbols, outline), out_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import numpy as np
+
+
+def _frozen(a, dtype, shape):
+    a = np.asarray(a, dtype=dtype).reshape(shape)
+    a.setflags(write=False)
+    return a
+
+
+class Mesh:
+    """Filled polygons and stroked segments in flat, contiguous buffers.
+
+    points: (P, 2) vertices of every polygon, one polygon after another;
+      polygon i is points[starts[i] - starts[0]:starts[i + 1] - starts[0]].
+    starts: (F + 1,) vertex offsets of the polygons.
+    fills: (F,) style id of each polygon, an index into `styles`.
+    segments: (E, 2, 2) stroked (start, end) segments.
+    strokes: (E,) style id of each segment.
+    groups: (G + 1, 2) (polygon, segment) offsets of each group, e.g. a
+      letter or a part.
+    styles: style of each id: a role such as "fg" or a literal colour.
+
+    Offsets are those of the buffers a mesh was sliced from, so group()
+    is a view sharing every buffer. Arrays are read-only, so meshes can be
+    cached and shared freely.
+    """
+
+    __slots__ = ("points", "starts", "fills", "segments", "strokes", "groups", "styles")
+
+    def __init__(self, points, starts, fills, segments, strokes, groups, styles):
+        self.points = _frozen(points, float, (-1, 2))
+        self.starts = _frozen(starts, np.int64, -1)
+        self.fills = _frozen(fills, np.int64, -1)
+        self.segments = _frozen(segments, float, (-1, 2, 2))
+        self.strokes = _frozen(strokes, np.int64, -1)
+        self.groups = _frozen(groups, np.int64, (-1, 2))
+        self.styles = tuple(styles)
+
+    def __len__(self):
+        """Number of groups."""
+        return len(self.groups) - 1
+
+    def __bool__(self):
+        """Whether there is anything to draw."""
+        return bool(len(self.fills) or len(self.segments))
+
+    def __iter__(self):
+        return (self.group(i) for i in range(len(self)))
+
+    def group(self, i):
+        """Group `i` as a Mesh of its own, sharing this one's buffers."""
+        (f0, e0), (f1, e1) = self.groups[i : i + 2] - self.groups[0]
+        p0, p1 = self.starts[[f0, f1]] - self.starts[0]
+        return Mesh(
+            self.points[p0:p1],
+            self.starts[f0 : f1 + 1],
+            self.fills[f0:f1],
+            self.segments[e0:e1],
+            self.strokes[e0:e1],
+            self.groups[i : i + 2],
+            self.styles,
+        )
+
+    def polygons(self, style=None):
+        """(N, 2) views of the polygons, only those of `style` if given."""
+        bounds = (self.starts - self.starts[0]).tolist()
+        pieces = [self.points[a:b] for a, b in zip(bounds, bounds[1:])]
+        if style is None:
+            return pieces
+        if style not in self.styles:
+            return []
+        sid = self.styles.index(style)
+        return [p for p, f in zip(pieces, self.fills.tolist()) if f == sid]
+
+    def faces(self):
+        """(polygon, style) pairs in drawing order."""
+        return list(zip(self.polygons(), (self.styles[f] for f in self.fills.tolist())))
+
+    def lines(self, style=None):
+        """The (E, 2, 2) segments, only those of `style` if given."""
+        if style is None:
+            return self.segments
+        if style not in self.styles:
+            return self.segments[:0]
+        return self.segments[self.strokes == self.styles.index(style)]
+
+    def bounds(self):
+        """(x_min, y_min, x_max, y_max) of every vertex and segment end."""
+        pts = [a for a in (self.points, self.segments.reshape(-1, 2)) if len(a)]
+        lo = np.min([a.min(axis=0) for a in pts], axis=0)
+        hi = np.max([a.max(axis=0) for a in pts], axis=0)
+        return (*lo.tolist(), *hi.tolist())
+
+    def translate(self, offset):
+        """The mesh moved by `offset`; only the coordinates are copied."""
+        return Mesh(
+            self.points + offset,
+            self.starts,
+            self.fills,
+            self.segments + offset,
+            self.strokes,
+            self.groups,
+            self.styles,
+        )
+
+    @property
+    def nbytes(self):
+        arrays = (self.points, self.starts, self.fills, self.segments, self.strokes)
+        return sum(a.nbytes for a in arrays) + self.groups.nbytes
+
+
+def pack(polygons=(), segments=(), styles=()):
+    """A one-group Mesh of (polygon, style) and (segments, style) pairs.
+
+    `segments` arrays are (N, 2, 2); `styles` fixes the first style ids,
+    any others follow in order of appearance.
+    """
+    styles = list(styles)
+    index = {s: i for i, s in enumerate(styles)}
+
+    def sid(style):
+        if style not in index:
+            index[style] = len(styles)
+            styles.append(style)
+        return index[style]
+
+    polys = [np.asarray(p, dtype=float).reshape(-1, 2) for p, _ in polygons]
+    fills = [sid(s) for _, s in polygons]
+    segs = [np.asarray(e, dtype=float).reshape(-1, 2, 2) for e, _ in segments]
+    strokes = [np.full(len(e), sid(s)) for e, (_, s) in zip(segs, segments)]
+    starts = np.cumsum([0] + [len(p) for p in polys])
+    return Mesh(
+        np.concatenate(polys) if polys else np.empty((0, 2)),
+        starts,
+        fills,
+        np.concatenate(segs) if segs else np.empty((0, 2, 2)),
+        np.concatenate(strokes) if strokes else [],
+        [(0, 0), (len(polys), sum(len(e) for e in segs))],
+        styles,
+    )
+
+
+def concat(meshes, offsets=None):
+    """One Mesh with each of `meshes` as a group, moved by `offsets`.
+
+    The buffers are copied once and translated in place; style ids are
+    renumbered over the union of the meshes' styles.
+    """
+    meshes = list(meshes)
+    styles = []
+    for m in meshes:
+        styles += [s for s in m.styles if s not in styles]
+    index = {s: i for i, s in enumerate(styles)}
+    ids = [np.array([index[s] for s in m.styles], dtype=np.int64) for m in meshes]
+
+    sizes = np.array([(len(m.points), len(m.segments)) for m in meshes]).reshape(-1, 2)
+    points = np.concatenate([np.empty((0, 2))] + [m.points for m in meshes])
+    segments = np.concatenate([np.empty((0, 2, 2))] + [m.segments for m in meshes])
+    if offsets is not None:
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+        points += np.repeat(offsets, sizes[:, 0], axis=0)
+        segments += np.repeat(offsets, sizes[:, 1], axis=0)[:, None]
+
+    base = np.cumsum(sizes[:, 0]) - sizes[:, 0]
+    starts = [m.starts[1:] - m.starts[0] + b for m, b in zip(meshes, base.tolist())]
+    counts = [(len(m.fills), len(m.segments)) for m in meshes]
+    return Mesh(
+        points,
+        np.concatenate([[0]] + starts),
+        np.concatenate([[]] + [i[m.fills] for i, m in zip(ids, meshes)]),
+        segments,
+        np.concatenate([[]] + [i[m.strokes] for i, m in zip(ids, meshes)]),
+        np.cumsum([(0, 0)] + counts, axis=0),
+        styles,
+    )
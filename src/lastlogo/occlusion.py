@@ -0,0 +1,221 @@
+import math
+
+import numpy as np
+
+EPS = 1e-7
+# Distance either side of an edge at which the covering face is sampled.
+PROBE = 1e-4
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def area(poly):
+    """Signed area of a polygon (positive when counter-clockwise)."""
+    return 0.5 * sum(
+        a[0] * b[1] - b[0] * a[1] for a, b in zip(poly, poly[1:] + poly[:1])
+    )
+
+
+def ccw(poly):
+    """`poly` as a list of (x, y) tuples in counter-clockwise order."""
+    pts = [tuple(p) for p in np.asarray(poly, dtype=float).tolist()]
+    return pts if area(pts) >= 0 else pts[::-1]
+
+
+def _clip(poly, a, b, inside):
+    """Sutherland-Hodgman: keep the part of `poly` on one side of a→b."""
+    out = []
+    n = len(poly)
+    for i in range(n):
+        p, q = poly[i], poly[(i + 1) % n]
+        dp, dq = _cross(a, b, p), _cross(a, b, q)
+        if not inside:
+            dp, dq = -dp, -dq
+        if dp >= -EPS:
+            out.append(p)
+        if (dp > EPS and dq < -EPS) or (dp < -EPS and dq > EPS):
+            t = dp / (dp - dq)
+            out.append((p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1])))
+    return out
+
+
+def _solid(poly):
+    return len(poly) >= 3 and area(poly) > EPS
+
+
+def intersect(p, q):
+    """Intersection of two convex CCW polygons."""
+    for a, b in zip(q, q[1:] + q[:1]):
+        p = _clip(p, a, b, True)
+        if not _solid(p):
+            return []
+    return p
+
+
+def subtract(p, q):
+    """Convex CCW polygon `p` minus convex CCW polygon `q`.
+
+    Returns disjoint convex pieces: for each edge of `q` in turn, the part
+    of what remains of `p` outside that edge is split off.
+    """
+    if not intersect(p, q):
+        return [p]
+    pieces = []
+    for a, b in zip(q, q[1:] + q[:1]):
+        outside = _clip(p, a, b, False)
+        if _solid(outside):
+            pieces.append(outside)
+        p = _clip(p, a, b, True)
+        if not _solid(p):
+            break
+    return pieces
+
+
+def contains(poly, pt):
+    """Whether `pt` lies strictly inside the convex CCW polygon `poly`."""
+    return all(_cross(a, b, pt) > EPS for a, b in zip(poly, poly[1:] + poly[:1]))
+
+
+def _top(layers, pt):
+    """Index of the last-painted layer covering `pt`, or None."""
+    for i in range(len(layers) - 1, -1, -1):
+        if contains(layers[i][0], pt):
+            return i
+    return None
+
+
+def _line_key(a, b):
+    """Key identifying the infinite line through a and b."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = math.hypot(dx, dy)
+    dx, dy = dx / length, dy / length
+    if dx < -EPS or (abs(dx) <= EPS and dy < 0):
+        dx, dy = -dx, -dy
+    offset = dx * a[1] - dy * a[0]
+    return (round(dx, 6), round(dy, 6), round(offset, 4))
+
+
+def _split_params(a, d, polys):
+    """Parameters along a + t*d where face boundaries cross or touch."""
+    ts = []
+    dd = d[0] * d[0] + d[1] * d[1]
+    for poly in polys:
+        for q0, q1 in zip(poly, poly[1:] + poly[:1]):
+            e = (q1[0] - q0[0], q1[1] - q0[1])
+            denom = d[0] * e[1] - d[1] * e[0]
+            w = (q0[0] - a[0], q0[1] - a[1])
+            if abs(denom) > EPS:
+                s = (w[0] * e[1] - w[1] * e[0]) / denom
+                u = (w[0] * d[1] - w[1] * d[0]) / denom
+                if -EPS <= u <= 1 + EPS:
+                    ts.append(s)
+            elif abs(w[0] * d[1] - w[1] * d[0]) / math.sqrt(dd) < EPS:
+                # Collinear boundary: its endpoints split the line.
+                ts.append((w[0] * d[0] + w[1] * d[1]) / dd)
+                ts.append(((q1[0] - a[0]) * d[0] + (q1[1] - a[1]) * d[1]) / dd)
+    return ts
+
+
+def visible(layers, edges):
+    """Resolve occlusion for `layers` painted in order.
+
+    layers: list of (polygon, role, owner). `role` is the fill a face is
+      painted with and `owner` the solid it belongs to.
+    edges: candidate (start, end) segments, e.g. every model edge.
+
+    Returns (faces, silhouette, contours):
+      faces: (pieces, role) for every layer, where pieces are the disjoint
+        convex polygons left visible (possibly none).
+      silhouette: (N, 2, 2) segments separating the layers from the
+        background.
+      contours: (start, end, left, right) where two faces painted with
+        different roles meet: a crease if both belong to one solid (same
+        owner), else an overlap. left and right index the layers on either
+        side (left of start→end in screen space).
+    """
+    layers = [(ccw(poly), role, owner) for poly, role, owner in layers]
+    polys = [poly for poly, _, _ in layers]
+
+    faces = []
+    for i, (poly, role, _) in enumerate(layers):
+        pieces = [poly]
+        for above in polys[i + 1 :]:
+            pieces = [r for piece in pieces for r in subtract(piece, above)]
+            if not pieces:
+                break
+        faces.append((pieces, role))
+
+    # Union the candidate edges per supporting line, so coincident edges of
+    # neighbouring solids are classified (and stroked) only once.
+    lines = {}
+    for start, end in np.asarray(edges, dtype=float).tolist():
+        a, b = tuple(start), tuple(end)
+        if math.hypot(b[0] - a[0], b[1] - a[1]) <= EPS:
+            continue
+        key = _line_key(a, b)
+        if key not in lines:
+            lines[key] = (a, (b[0] - a[0], b[1] - a[1]), [])
+        origin, d, spans = lines[key]
+        dd = d[0] * d[0] + d[1] * d[1]
+        ta = ((a[0] - origin[0]) * d[0] + (a[1] - origin[1]) * d[1]) / dd
+        tb = ((b[0] - origin[0]) * d[0] + (b[1] - origin[1]) * d[1]) / dd
+        spans.append((min(ta, tb), max(ta, tb)))
+
+    silhouette, contours = [], []
+    for origin, d, spans in lines.values():
+        length = math.hypot(*d)
+        normal = (-d[1] / length * PROBE, d[0] / length * PROBE)
+        cuts = _split_params(origin, d, polys)
+
+        def at(t):
+            return (origin[0] + t * d[0], origin[1] + t * d[1])
+
+        merged = []
+        for t0, t1 in sorted(spans):
+            if merged and t0 <= merged[-1][1] + EPS:
+                merged[-1][1] = max(merged[-1][1], t1)
+            else:
+                merged.append([t0, t1])
+
+        for t0, t1 in merged:
+            ts = [t0]
+            for t in sorted(t for t in cuts if t0 + EPS < t < t1 - EPS):
+                if t - ts[-1] > EPS:
+                    ts.append(t)
+            ts.append(t1)
+            runs = []
+            for u0, u1 in zip(ts, ts[1:]):
+                mid = at((u0 + u1) / 2)
+                kind = _classify(layers, mid, normal)
+                if runs and runs[-1][0] == kind:
+                    runs[-1][2] = u1
+                else:
+                    runs.append([kind, u0, u1])
+            for kind, u0, u1 in runs:
+                if kind is None:
+                    continue
+                if kind == "silhouette":
+                    silhouette.append((at(u0), at(u1)))
+                else:
+                    contours.append((at(u0), at(u1), *kind))
+
+    return faces, np.array(silhouette).reshape(-1, 2, 2), contours
+
+
+def _classify(layers, mid, normal):
+    """What an edge through `mid` separates.
+
+    Returns "silhouette", a (left, right) pair of layer indices for a
+    contour, or None.
+    """
+    left = _top(layers, (mid[0] + normal[0], mid[1] + normal[1]))
+    right = _top(layers, (mid[0] - normal[0], mid[1] - normal[1]))
+    if left == right:
+        return None
+    if left is None or right is None:
+        return "silhouette"
+    if layers[left][1] != layers[right][1]:
+        return (left, right)
+    return None
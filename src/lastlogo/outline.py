@@ -0,0 +1,182 @@
+import math
+
+import numpy as np
+
+# Greatest distance, in user units, by which the polygon standing in for a
+# round cap or join may stick out past the circle.
+TOLERANCE = 0.05
+# Points closer than this, relative to the size of the drawing, are one.
+SNAP = 1e-9
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def disc(r, tolerance=TOLERANCE):
+    """A regular polygon around a circle of radius `r`, as (N, 2) points.
+
+    Its sides touch the circle and its corners stick out by at most
+    `tolerance`. N is a multiple of 4 and the sides face the axes, so
+    horizontal and vertical strokes keep their exact width.
+    """
+    half = math.acos(r / (r + tolerance))
+    n = 4 * max(2, math.ceil(math.pi / (4 * half)))
+    angles = 2 * math.pi * (np.arange(n) + 0.5) / n
+    return r / math.cos(math.pi / n) * np.stack([np.cos(angles), np.sin(angles)], 1)
+
+
+def _hull(points, eps):
+    """Convex hull of `points`, counter-clockwise, without collinear points."""
+    points = sorted(set(map(tuple, np.asarray(points).tolist())))
+
+    def half(points):
+        out = []
+        for p in points:
+            while len(out) > 1:
+                (x0, y0), (x1, y1) = out[-2], out[-1]
+                if (x1 - x0) * (p[1] - y0) - (y1 - y0) * (p[0] - x0) > eps:
+                    break
+                out.pop()
+            out.append(p)
+        return out[:-1]
+
+    return np.array(half(points) + half(points[::-1]))
+
+
+def capsules(segments, r, tolerance=TOLERANCE):
+    """Each of `segments` stroked `2 * r` wide with round caps: the convex
+    hull, counter-clockwise, of a disc() about either end."""
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    shape = disc(r, tolerance)
+    eps = SNAP * (float(np.abs(segments).max(initial=0)) + r)
+    return [_hull(np.concatenate([a + shape, b + shape]), eps) for a, b in segments]
+
+
+def _splits(edges, eps):
+    """Points where each of `edges` crosses or touches another, per edge.
+
+    A crossing is computed once and handed to both edges, so their pieces
+    end at the very same point.
+    """
+    p, q = edges[:, 0], edges[:, 1]
+    d = q - p
+    length = np.maximum(np.hypot(d[:, 0], d[:, 1]), eps)
+    cuts = [[] for _ in edges]
+
+    # Ends of every edge against every other: T-junctions and overlaps
+    for end in (p, q):
+        rel = end[None, :, :] - p[:, None, :]  # [edge, end]
+        along = np.einsum("ikj,ij->ik", rel, d) / length[:, None]
+        off = np.abs(_cross(rel, d[:, None, :])) / length[:, None]
+        inside = (off < eps) & (along > eps) & (along < length[:, None] - eps)
+        for i, k in zip(*np.nonzero(inside)):
+            cuts[i].append(end[k])
+
+    # Proper crossings
+    denom = _cross(d[:, None, :], d[None, :, :])
+    rel = p[None, :, :] - p[:, None, :]  # [i, j]: p_j - p_i
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = _cross(rel, d[None, :, :]) / denom
+        u = _cross(rel, d[:, None, :]) / denom
+    lo_t, lo_u = eps / length[:, None], eps / length[None, :]
+    crossing = np.abs(denom) > 1e-12 * length[:, None] * length[None, :]
+    crossing &= (t > lo_t) & (t < 1 - lo_t) & (u > lo_u) & (u < 1 - lo_u)
+    for i, j in zip(*np.nonzero(np.triu(crossing))):
+        point = p[i] + t[i, j] * d[i]
+        cuts[i].append(point)
+        cuts[j].append(point)
+    return cuts
+
+
+def _simplify(loop, eps):
+    """`loop` without the points where it runs straight on."""
+    prev, nxt = np.roll(loop, 1, axis=0), np.roll(loop, -1, axis=0)
+    turn = _cross(loop - prev, nxt - loop)
+    return loop[np.abs(turn) > eps * np.hypot(*(nxt - prev).T)]
+
+
+def union(polygons, eps):
+    """Boundary loops of the union of convex counter-clockwise `polygons`.
+
+    Every edge is cut where it meets another. Pieces strictly inside some
+    polygon are dropped, as are pieces met in both directions (seams), and
+    the rest chain into loops that neither cross nor touch: outer ones
+    counter-clockwise, holes clockwise. Returns None if the pieces don't
+    close up into such loops.
+    """
+    a = np.concatenate(polygons)
+    b = np.concatenate([np.roll(p, -1, axis=0) for p in polygons])
+    cuts = _splits(np.stack([a, b], axis=1), eps)
+
+    starts, ends = [], []
+    for p, q, points in zip(a, b, cuts):
+        if points:
+            d = q - p
+            chain = [p, *sorted(points, key=lambda c: float(np.dot(c - p, d))), q]
+            starts += chain[:-1]
+            ends += chain[1:]
+        else:
+            starts.append(p)
+            ends.append(q)
+    starts, ends = np.array(starts), np.array(ends)
+    keys = np.rint(np.concatenate([starts, ends]) / eps).astype(np.int64).tolist()
+    keys = list(map(tuple, keys))
+    coords = dict(zip(keys, np.concatenate([starts, ends])))
+    pieces = {}
+    for s, e, mid in zip(keys, keys[len(starts) :], (starts + ends) / 2):
+        if s != e:
+            pieces[s, e] = mid
+    pieces = {k: mid for k, mid in pieces.items() if k[::-1] not in pieces}
+    if not pieces:
+        return []
+
+    # Inside a polygon: strictly left of each of its edges
+    d = b - a
+    rel = np.array(list(pieces.values()))[:, None, :] - a[None, :, :]
+    left = _cross(d[None, :, :], rel) > eps * np.hypot(d[:, 0], d[:, 1])
+    first = np.cumsum([0] + [len(p) for p in polygons[:-1]])
+    inside = np.logical_and.reduceat(left, first, axis=1).any(axis=1)
+
+    after = {}
+    for (s, e), dropped in zip(pieces, inside.tolist()):
+        if not dropped:
+            if s in after:
+                return None
+            after[s] = e
+    loops = []
+    while after:
+        start, point = after.popitem()
+        loop = [start]
+        while point != start:
+            if point not in after:
+                return None
+            loop.append(point)
+            point = after.pop(point)
+        loops.append(_simplify(np.array([coords[k] for k in loop]), eps))
+    return [loop for loop in loops if len(loop) > 2]
+
+
+def stroke_outline(segments, width, tolerance=TOLERANCE):
+    """The area round-capped strokes `width` wide along `segments` cover.
+
+    Returns (loops, fill_rule): the boundary of the union of the strokes'
+    capsules(), which fills it under "evenodd" (a hole is a loop inside
+    another); or, should the union not close up, the capsules themselves,
+    overlapping, under "nonzero". Either way it is a single fill.
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    if not len(segments):
+        return [], "nonzero"
+    r = width / 2
+    eps = SNAP * (float(np.abs(segments).max()) + width)
+    # Repeated strokes would only add seams to cut away
+    unique = {}
+    for seg in segments:
+        ends = sorted(tuple(np.rint(p / eps).astype(np.int64).tolist()) for p in seg)
+        unique.setdefault(tuple(ends), seg)
+    hulls = capsules(list(unique.values()), r, tolerance)
+    loops = union(hulls, eps)
+    if loops is None:
+        return hulls, "nonzero"
+    return loops, "evenodd"
@@ -0,0 +1,258 @@
+import io
+
+from .profiling import count, span
+
+# Painter used when none is named.
+PAINTER = "cairo"
+# Formats a painter can write; PDF needs Cairo.
+PAINT_FORMATS = ("png", "pdf")
+# Samples per pixel along each axis of the Pillow painter.
+SUPERSAMPLE = 4
+
+
+def _rgba(colour):
+    from PIL import ImageColor
+
+    return ImageColor.getrgb(colour)
+
+
+class CairoCanvas:
+    """Paint each primitive straight onto a Cairo surface.
+
+    The drawing never becomes SVG: points go from the emitter to Cairo
+    paths as floats. `fmt` is "png", "pdf" (1 px to 1 pt) or None to keep
+    the surface for image(). `width` is the PNG width in px.
+    """
+
+    # Primitives are painted as given, so emitters needn't build path data.
+    direct = True
+
+    def __init__(self, stream, size, fmt="png", width=None):
+        import cairocffi as cairo
+
+        self.cairo = cairo
+        self.stream = stream
+        self.size = size
+        self.fmt = fmt
+        w, h = size
+        if fmt == "pdf":
+            self.surface = cairo.PDFSurface(stream, w, h)
+            scale = 1
+        else:
+            scale = width / w if width else 1
+            px = (round(w * scale), round(h * scale))
+            self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, *px)
+        self.ctx = cairo.Context(self.surface)
+        self.ctx.scale(scale, scale)
+        self.ctx.set_miter_limit(4)  # SVG's default
+        self._styles = [{}]
+
+    def polygon(self, points, **attrs):
+        self._paint([points], True, attrs)
+
+    def region(self, pieces, **attrs):
+        self._paint(pieces, True, attrs)
+
+    def line(self, start, end, **attrs):
+        self._paint([(start, end)], False, attrs)
+
+    def begin_group(self, **attrs):
+        self._styles.append({**self._styles[-1], **attrs})
+
+    def end_group(self):
+        self._styles.pop()
+
+    def close(self):
+        with span(f"cairo-{self.fmt}", "encode"):
+            if self.fmt == "pdf":
+                self.surface.finish()
+            elif self.fmt == "png":
+                self.surface.write_to_png(self.stream)
+
+    def image(self):
+        """The painted surface as an RGBA Pillow image."""
+        from PIL import Image
+
+        self.surface.flush()
+        size = (self.surface.get_width(), self.surface.get_height())
+        data = bytes(self.surface.get_data())
+        stride = self.surface.get_stride()
+        im = Image.frombuffer("RGBa", size, data, "raw", "BGRa", stride, 1)
+        return im.convert("RGBA")
+
+    def _paint(self, pieces, closed, attrs):
+        count("elements")
+        style = {**self._styles[-1], **attrs}
+        ctx = self.ctx
+        ctx.new_path()
+        for (x, y), *rest in pieces:
+            ctx.move_to(x, y)
+            for x, y in rest:
+                ctx.line_to(x, y)
+            if closed:
+                ctx.close_path()
+        fill = style.get("fill", "black") if closed else "none"
+        if fill != "none":
+            ctx.set_source_rgb(*(c / 255 for c in _rgba(fill)[:3]))
+            ctx.set_fill_rule(
+                self.cairo.FILL_RULE_EVEN_ODD
+                if style.get("fill_rule") == "evenodd"
+                else self.cairo.FILL_RULE_WINDING
+            )
+            ctx.fill_preserve()
+        stroke = style.get("stroke", "none")
+        if stroke != "none":
+            cairo = self.cairo
+            ctx.set_source_rgb(*(c / 255 for c in _rgba(stroke)[:3]))
+            ctx.set_line_width(float(style.get("stroke_width", 1)))
+            ctx.set_line_cap(
+                {"round": cairo.LINE_CAP_ROUND, "square": cairo.LINE_CAP_SQUARE}.get(
+                    style.get("stroke_linecap"), cairo.LINE_CAP_BUTT
+                )
+            )
+            ctx.set_line_join(
+                {"round": cairo.LINE_JOIN_ROUND, "bevel": cairo.LINE_JOIN_BEVEL}.get(
+                    style.get("stroke_linejoin"), cairo.LINE_JOIN_MITER
+                )
+            )
+            ctx.stroke_preserve()
+        ctx.new_path()
+
+
+class PillowCanvas:
+    """Paint each primitive onto a supersampled Pillow image.
+
+    Needs nothing but Pillow. Shapes are drawn aliased at SUPERSAMPLE
+    times the resolution and box-filtered down, which antialiases them.
+    Round caps and joins are drawn as discs; other joins are left open.
+    Even-odd regions are filled through an XOR of their pieces. PNG only.
+    """
+
+    direct = True
+
+    def __init__(self, stream, size, fmt="png", width=None, supersample=SUPERSAMPLE):
+        from PIL import Image, ImageDraw
+
+        if fmt not in ("png", None):
+            raise ValueError(f"the Pillow painter can't write {fmt!r}; use cairo")
+        self.stream = stream
+        self.size = size
+        self.fmt = fmt
+        w, h = size
+        scale = width / w if width else 1
+        self.px = (round(w * scale), round(h * scale))
+        self.supersample = supersample
+        self.scale = scale * supersample
+        self.im = Image.new("RGBA", tuple(v * supersample for v in self.px))
+        self.draw = ImageDraw.Draw(self.im)
+        self._styles = [{}]
+
+    def polygon(self, points, **attrs):
+        self._paint([points], True, attrs)
+
+    def region(self, pieces, **attrs):
+        self._paint(pieces, True, attrs)
+
+    def line(self, start, end, **attrs):
+        self._paint([(start, end)], False, attrs)
+
+    def begin_group(self, **attrs):
+        self._styles.append({**self._styles[-1], **attrs})
+
+    def end_group(self):
+        self._styles.pop()
+
+    def close(self):
+        if self.fmt == "png":
+            with span("pillow-png", "encode"):
+                self.image().save(self.stream, "PNG")
+
+    def image(self):
+        """The painted image, downsampled, as RGBA."""
+        # Filter premultiplied, so transparent edges don't darken
+        return self.im.convert("RGBa").reduce(self.supersample).convert("RGBA")
+
+    def _paint(self, pieces, closed, attrs):
+        count("elements")
+        style = {**self._styles[-1], **attrs}
+        k = self.scale
+        pieces = [[(x * k, y * k) for x, y in piece] for piece in pieces]
+        fill = style.get("fill", "black") if closed else "none"
+        if fill != "none":
+            if style.get("fill_rule") == "evenodd" and len(pieces) > 1:
+                self._fill_evenodd(pieces, _rgba(fill))
+            else:
+                for piece in pieces:
+                    self.draw.polygon(piece, fill=_rgba(fill))
+        stroke = style.get("stroke", "none")
+        if stroke == "none":
+            return
+        colour = _rgba(stroke)
+        width = float(style.get("stroke_width", 1)) * k
+        round_ends = style.get("stroke_linecap") == "round" or (
+            closed and style.get("stroke_linejoin") == "round"
+        )
+        r = width / 2
+        for piece in pieces:
+            ring = piece + piece[:1] if closed else piece
+            self.draw.line(ring, fill=colour, width=max(1, round(width)))
+            if round_ends:
+                for x, y in ring:
+                    self.draw.ellipse((x - r, y - r, x + r, y + r), fill=colour)
+
+    def _fill_evenodd(self, pieces, colour):
+        """Fill where an odd number of `pieces` overlap, e.g. around holes."""
+        from PIL import Image, ImageChops, ImageDraw
+
+        xs = [x for piece in pieces for x, _ in piece]
+        ys = [y for piece in pieces for _, y in piece]
+        x0, y0 = max(0, int(min(xs))), max(0, int(min(ys)))
+        x1 = min(self.im.width, int(max(xs)) + 2)
+        y1 = min(self.im.height, int(max(ys)) + 2)
+        if x1 <= x0 or y1 <= y0:
+            return
+        mask = Image.new("1", (x1 - x0, y1 - y0))
+        for piece in pieces:
+            layer = Image.new("1", mask.size)
+            ImageDraw.Draw(layer).polygon([(x - x0, y - y0) for x, y in piece], fill=1)
+            mask = ImageChops.logical_xor(mask, layer)
+        self.im.paste(colour, (x0, y0, x1, y1), mask)
+
+
+PAINTERS = {"cairo": CairoCanvas, "pillow": PillowCanvas}
+
+
+def _painter(painter, fmt, width, canvases):
+    try:
+        canvas = PAINTERS[painter]
+    except KeyError:
+        raise ValueError(f"unknown painter {painter!r}") from None
+
+    def open_painter(stream, size):
+        canvases.append(canvas(stream, size, fmt, width))
+        return canvases[-1]
+
+    return open_painter
+
+
+def paint(drawing, fmt="png", width=None, painter=PAINTER, **kw):
+    """Run `drawing(stream, backend=..., **kw)` on a painter; return the file.
+
+    `drawing` is an asset's drawing function (e.g. icon_drawing) and `kw`
+    its colours and options. PNGs are `width` px wide (default: 1 px per
+    unit).
+    """
+    if fmt not in PAINT_FORMATS:
+        raise ValueError(f"unknown paint format {fmt!r}")
+    buf = io.BytesIO()
+    with span(painter, "paint"):
+        drawing(buf, backend=_painter(painter, fmt, width, []), **kw)
+    return buf.getvalue()
+
+
+def paint_image(drawing, width=None, painter=PAINTER, **kw):
+    """Like paint(), but return the RGBA Pillow image itself."""
+    canvases = []
+    with span(painter, "paint"):
+        drawing(None, backend=_painter(painter, None, width, canvases), **kw)
+        return canvases[0].image()
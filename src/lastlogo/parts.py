@@ -0,0 +1,135 @@
+import io
+from pathlib import Path
+
+import numpy as np
+
+from .backend import BACKEND, open_canvas
+from .cache import memoize
+from .emit import PRECISION, emitter
+from .icon import ACCENT
+from .incremental import build
+from .mesh import concat, pack
+from .projection import project
+from .voxels import PARTS, SIDES, cube_grid, edges, faces, outline
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+SIDE = 100
+
+# Face shading of the 3D parts: top=lightest, right/front=mid, left=darkest
+TEAL = {"top": "#6CB5BA", "right": ACCENT, "left": "#487E82"}
+BLACK = {"top": "#3D3D3D", "right": "#262626", "left": "#151515"}
+WHITE = {"top": "#FFFFFF", "right": "#DCDCDC", "left": "#B8B8B8"}
+# Fill of each flat part, and the shades of each 3D part by (axis, sign)
+# of the side a face is on.
+FILLS = {"teal": ACCENT, "black": "black", "white": "white"}
+SHADES = {
+    name: dict(zip(SIDES, (shades["top"], shades["left"], shades["right"])))
+    for name, shades in zip(PARTS, (TEAL, BLACK, WHITE))
+}
+
+
+@memoize()
+def part_shapes(s=SIDE):
+    """Projected geometry of the cube parts, unshifted: (hexagon, flat, solids).
+
+    Everything is derived from the voxel cube (see voxels.py). hexagon is
+    the cube's silhouette. flat and solids are Meshes with a group per
+    part, in PARTS order. A flat part is its outline within the cube,
+    styled by its fill colour; a 3D part is the part on its own: its
+    visible faces, shaded by side and drawn back to front, and its edges,
+    styled "black".
+    """
+    grid = cube_grid()
+    unit = s / len(grid)
+
+    def screen(pts):
+        pts = np.asarray(pts) * unit
+        return project(pts.reshape(-1, 3)).reshape(*pts.shape[:-1], 2)
+
+    hexagon = screen(outline(grid, grid > 0))
+    flat, solids = [], []
+    for number, name in enumerate(PARTS, 1):
+        part = grid == number
+        flat.append(pack([(screen(outline(grid, part)), FILLS[name])]))
+        shades = SHADES[name]
+        solids.append(
+            pack(
+                [(screen(poly), shades[side]) for poly, _, side in faces(part)],
+                [(screen(edges(part)), "black")],
+            )
+        )
+    return hexagon, concat(flat), concat(solids)
+
+
+def part_names():
+    """Names of the parts: each flat part, then each 3D part as "name-3d"."""
+    return [*PARTS, *(f"{name}-3d" for name in PARTS)]
+
+
+def part_drawing(
+    stream, name, precision=PRECISION, backend=BACKEND, symbols=False, outline=False
+):
+    """Draw part `name` (see part_names()) to `stream`; return its size.
+
+    Every part shares the frame of the whole cube.
+    """
+    hexagon, flat, solids = part_shapes()
+    pad = 6 / 2
+    x_min, y_min = hexagon.min(axis=0)
+    x_max, y_max = hexagon.max(axis=0)
+    offset = (-x_min + pad, -y_min + pad)
+    part, solid = name.removesuffix("-3d"), name.endswith("-3d")
+    if part not in PARTS:
+        raise ValueError(f"unknown part {name!r}")
+    part = (solids if solid else flat).group(PARTS.index(part)).translate(offset)
+
+    canvas = open_canvas(stream, (x_max - x_min + 6, y_max - y_min + 6), backend)
+    out = emitter(canvas, precision, symbols, outline)
+    if not solid:
+        ((points, fill),) = part.faces()
+        out.polygons(
+            [points],
+            fill=fill,
+            stroke="black",
+            stroke_width=6,
+            stroke_linejoin="round",
+        )
+    else:
+        for verts, color in part.faces():
+            out.polygons([verts], fill=color, stroke="none")
+        out.lines(
+            part.lines("black"), stroke="black", stroke_width=6, stroke_linecap="round"
+        )
+    out.close()
+    canvas.close()
+    return canvas.size
+
+
+def artifacts(precision=PRECISION, backend=BACKEND, symbols=False, outline=False):
+    """(filenames, params, render) for each file main() writes."""
+    params = dict(
+        precision=precision, backend=backend, symbols=symbols, outline=outline
+    )
+    for name in part_names():
+
+        def render(name=name):
+            buf = io.StringIO()
+            part_drawing(buf, name, precision, backend, symbols, outline)
+            return [buf.getvalue().encode()]
+
+        yield (f"part-{name}.svg",), params, render
+
+
+def main(
+    out_dir=OUTPUT_DIR,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    outline=False,
+):
+    build(__name__, artifacts(precision, backend, symbols, outline), out_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from .batch import ASSETS, _template
+from .profiling import count, span
+from .sprite import _ATTR_RE, _SVG_TAG_RE, svg_body
+from .template import THEMES
+
+POSTER_FORMATS = ("png", "tiff")
+# Pixels per tile (16 MB of RGBA) and tiles held at once, rendering or
+# waiting to be written: peak memory is about their product, whatever the
+# poster size.
+TILE_PIXELS = 1 << 22
+MAX_TILES = 8
+# zlib level of PNG and TIFF data.
+LEVEL = 6
+# Bytes of compressed PNG data per IDAT chunk.
+IDAT_BYTES = 1 << 20
+
+# Root attributes a tile sets itself.
+_GEOMETRY = (b"width", b"height", b"viewBox", b"preserveAspectRatio")
+
+
+def view_box(svg):
+    """(x, y, width, height) of the user space an SVG document shows."""
+    attrs = dict(_ATTR_RE.findall(_SVG_TAG_RE.search(svg).group(1)))
+    if b"viewBox" in attrs:
+        return tuple(float(v) for v in attrs[b"viewBox"].replace(b",", b" ").split())
+    return 0.0, 0.0, float(attrs[b"width"]), float(attrs[b"height"])
+
+
+def poster_size(svg, width):
+    """(width, height) in px of `svg` rendered `width` px wide."""
+    _, _, w, h = view_box(svg)
+    return width, max(1, round(width * h / w))
+
+
+def bands(size, tile_pixels=TILE_PIXELS):
+    """Split a (width, height) poster into (y0, y1) tiles of whole rows.
+
+    Tiles span the full width, so every scanline comes from a single tile
+    and can be written as soon as that tile is done; each holds at most
+    `tile_pixels` pixels (but at least one row).
+    """
+    width, height = size
+    rows = max(1, tile_pixels // width)
+    return [(y, min(y + rows, height)) for y in range(0, height, rows)]
+
+
+def tile_svg(svg, size, y0, y1):
+    """`svg` cropped to rows y0..y1 of its (width, height) px rendering.
+
+    Only the root element changes: its viewBox selects the tile's part of
+    the user space, so each tile renders exactly the pixels it covers in
+    the full image and neighbouring tiles meet without seams.
+    """
+    vx, vy, vw, _ = view_box(svg)
+    width = size[0]
+    attrs = [
+        b'%s="%s"' % kv
+        for kv in _ATTR_RE.findall(_SVG_TAG_RE.search(svg).group(1))
+        if kv[0] not in _GEOMETRY
+    ]
+    # User units per px, as in the full render: uniform, set by the width
+    unit = vw / width
+    attrs.append(
+        b'width="%d" height="%d" viewBox="%r %r %r %r" preserveAspectRatio="none"'
+        % (width, y1 - y0, vx, vy + y0 * unit, vw, (y1 - y0) * unit)
+    )
+    return b"<svg " + b" ".join(attrs) + b">" + svg_body(svg) + b"</svg>\n"
+
+
+def render_tile(svg, size, y0, y1, fmt):
+    """Rasterize one tile; return its rows as the format's data.
+
+    PNG tiles are filtered scanlines, compressed by the writer as one
+    stream. TIFF tiles are whole strips, so they are compressed here, in
+    parallel.
+    """
+    from PIL import Image
+
+    from .raster import render
+
+    width = size[0]
+    im = render(tile_svg(svg, size, y0, y1))
+    if im.size != (width, y1 - y0):
+        # Guard against a renderer rounding the tile size
+        canvas = Image.new("RGBA", (width, y1 - y0))
+        canvas.paste(im, (0, 0))
+        im = canvas
+    data = im.tobytes()
+    if fmt == "tiff":
+        return zlib.compress(data, LEVEL)
+    stride = width * 4
+    # Filter type 0 (none) before every scanline
+    return b"".join(b"\0" + data[i : i + stride] for i in range(0, len(data), stride))
+
+
+def _chunk(kind, data):
+    body = kind + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+class PNGWriter:
+    """Write an RGBA PNG to `stream` a band of scanlines at a time."""
+
+    def __init__(self, stream, size):
+        self.stream = stream
+        self.z = zlib.compressobj(LEVEL)
+        self.pending = []
+        self.buffered = 0
+        ihdr = struct.pack(">IIBBBBB", *size, 8, 6, 0, 0, 0)
+        stream.write(b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", ihdr))
+
+    def write(self, rows):
+        """Add filtered scanlines, as returned by render_tile()."""
+        self._idat(self.z.compress(rows))
+
+    def close(self):
+        self._idat(self.z.flush(), final=True)
+        self.stream.write(_chunk(b"IEND", b""))
+
+    def _idat(self, data, final=False):
+        if data:
+            self.pending.append(data)
+            self.buffered += len(data)
+        if self.buffered >= IDAT_BYTES or (final and self.buffered):
+            self.stream.write(_chunk(b"IDAT", b"".join(self.pending)))
+            self.pending, self.buffered = [], 0
+
+
+class TIFFWriter:
+    """Write an RGBA TIFF to a seekable `stream`, one Deflate strip per tile.
+
+    Strips go out as they arrive; the directory with their offsets follows
+    them, and close() points the header at it. Classic TIFF offsets are 32
+    bit, so the compressed file must stay under 4 GB.
+    """
+
+    def __init__(self, stream, size, rows_per_strip):
+        self.stream = stream
+        self.size = size
+        self.rows_per_strip = rows_per_strip
+        self.start = stream.tell()
+        self.offsets = []
+        self.counts = []
+        stream.write(b"II*\0" + struct.pack("<I", 0))
+
+    def write(self, strip):
+        """Add one compressed strip, as returned by render_tile()."""
+        offset = self._tell()
+        if offset + len(strip) >= 1 << 32:
+            raise ValueError("poster too large for TIFF; write a PNG instead")
+        self.offsets.append(offset)
+        self.counts.append(len(strip))
+        self.stream.write(strip)
+
+    def close(self):
+        n = len(self.offsets)
+        if self._tell() % 2:
+            self.stream.write(b"\0")  # values and the directory are word-aligned
+        # Out-of-line values: BitsPerSample, X/YResolution, strip arrays
+        bits = self._tell()
+        res = bits + 8
+        offsets = res + 8
+        counts = offsets + 4 * n
+        self.stream.write(struct.pack("<4H", 8, 8, 8, 8))
+        self.stream.write(struct.pack("<II", 72, 1))
+        self.stream.write(struct.pack(f"<{n}I", *self.offsets))
+        self.stream.write(struct.pack(f"<{n}I", *self.counts))
+        width, height = self.size
+        entries = [
+            (256, 4, 1, width),  # ImageWidth
+            (257, 4, 1, height),  # ImageLength
+            (258, 3, 4, bits),  # BitsPerSample
+            (259, 3, 1, 8),  # Compression: Deflate
+            (262, 3, 1, 2),  # Photometric: RGB
+            (273, 4, n, offsets if n > 1 else self.offsets[0]),  # StripOffsets
+            (277, 3, 1, 4),  # SamplesPerPixel
+            (278, 4, 1, self.rows_per_strip),  # RowsPerStrip
+            (279, 4, n, counts if n > 1 else self.counts[0]),  # StripByteCounts
+            (282, 5, 1, res),  # XResolution
+            (283, 5, 1, res),  # YResolution
+            (284, 3, 1, 1),  # PlanarConfiguration: chunky
+            (296, 3, 1, 2),  # ResolutionUnit: inch
+            (338, 3, 1, 2),  # ExtraSamples: unassociated alpha
+        ]
+        ifd = self._tell()
+        self.stream.write(struct.pack("<H", len(entries)))
+        for tag, kind, n_values, value in entries:
+            self.stream.write(struct.pack("<HHII", tag, kind, n_values, value))
+        self.stream.write(struct.pack("<I", 0))
+        end = self.stream.tell()
+        self.stream.seek(self.start + 4)
+        self.stream.write(struct.pack("<I", ifd))
+        self.stream.seek(end)
+
+    def _tell(self):
+        return self.stream.tell() - self.start
+
+
+def render_poster(
+    svg,
+    stream,
+    width,
+    fmt="png",
+    max_tiles=MAX_TILES,
+    tile_pixels=TILE_PIXELS,
+    workers=None,
+):
+    """Rasterize `svg` `width` px wide into a PNG or TIFF on `stream`.
+
+    Tiles are rendered across a process pool and written in order as soon
+    as each is next in line. At most `max_tiles` tiles are rendering or
+    waiting at once, so peak memory is bounded by max_tiles * tile_pixels
+    whatever the size of the poster. Returns its (width, height).
+    """
+    if fmt not in POSTER_FORMATS:
+        raise ValueError(f"unknown poster format {fmt!r}")
+    size = poster_size(svg, width)
+    tiles = bands(size, tile_pixels)
+    if fmt == "png":
+        writer = PNGWriter(stream, size)
+    else:
+        writer = TIFFWriter(stream, size, tiles[0][1] - tiles[0][0])
+    workers = max(1, min(workers or os.cpu_count() or 1, max_tiles, len(tiles)))
+
+    with ProcessPoolExecutor(workers) as pool:
+        todo = list(enumerate(tiles))[::-1]
+        running, done = {}, {}
+        written = 0
+        while written < len(tiles):
+            while todo and len(running) + len(done) < max_tiles:
+                i, (y0, y1) = todo.pop()
+                running[pool.submit(render_tile, svg, size, y0, y1, fmt)] = i
+            # Wait for a new tile only when the next one isn't here yet
+            if written not in done:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done[running.pop(future)] = future.result()
+            while written in done:
+                data = done.pop(written)
+                with span("write", "io", tile=written):
+                    writer.write(data)
+                count("bytes_written", len(data))
+                written += 1
+    writer.close()
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.poster",
+        description="Render a poster-scale PNG or TIFF in tiles, in bounded memory.",
+    )
+    parser.add_argument("asset", choices=ASSETS)
+    parser.add_argument("-w", "--width", type=int, required=True, help="px")
+    parser.add_argument("-t", "--theme", choices=sorted(THEMES), default="light")
+    parser.add_argument("-f", "--format", choices=POSTER_FORMATS)
+    parser.add_argument("--max-tiles", type=int, default=MAX_TILES)
+    parser.add_argument(
+        "--tile-mpx",
+        type=float,
+        default=TILE_PIXELS / 1e6,
+        help="megapixels per tile (default: %(default).1f)",
+    )
+    parser.add_argument("-j", "--jobs", type=int, help="render processes")
+    parser.add_argument("-o", "--output", type=Path, help="default: ASSET-WIDTH.FMT")
+    args = parser.parse_args(argv)
+    if args.width < 1:
+        parser.error("--width must be at least 1")
+    if args.max_tiles < 1:
+        parser.error("--max-tiles must be at least 1")
+    if args.tile_mpx <= 0:
+        parser.error("--tile-mpx must be positive")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    fmt = args.format
+    if fmt is None:
+        suffix = args.output.suffix.lower().lstrip(".") if args.output else "png"
+        fmt = "tiff" if suffix in ("tif", "tiff") else "png"
+    output = args.output or Path(f"{args.asset}-{args.width}.{fmt}")
+    svg = _template(args.asset, {}).render(**THEMES[args.theme])
+
+    t0 = time.perf_counter()
+    with open(output, "wb") as f:
+        size = render_poster(
+            svg,
+            f,
+            args.width,
+            fmt,
+            args.max_tiles,
+            round(args.tile_mpx * 1e6),
+            args.jobs,
+        )
+    wall = time.perf_counter() - t0
+    print(
+        f"Saved {output} ({size[0]}x{size[1]}, {output.stat().st_size:,} bytes)"
+        f" in {wall:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
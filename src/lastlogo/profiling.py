@@ -0,0 +1,192 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+# Set to a trace path (or "1" for TRACE) to profile any lastlogo entry point.
+ENV = "LASTLOGO_PROFILE"
+# Chrome-trace file written when no path is given.
+TRACE = "lastlogo-trace.json"
+
+# The active Profile, or None. Everything below is a no-op while it is None.
+_profile = None
+_reporting = False
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ("profile", "name", "cat", "args", "counters", "start", "child")
+
+    def __init__(self, profile, name, cat, args):
+        self.profile = profile
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.counters = Counter()
+        self.child = 0
+
+    def __enter__(self):
+        self.profile.stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        stack = self.profile.stack()
+        stack.pop()
+        dur = end - self.start
+        if stack:
+            stack[-1].child += dur
+        self.profile.events.append(
+            dict(
+                name=self.name,
+                cat=self.cat,
+                start=self.start,
+                dur=dur,
+                self=dur - self.child,
+                tid=threading.get_ident(),
+                args=self.args,
+                counters=dict(self.counters),
+            )
+        )
+
+
+class Profile:
+    """Spans and counters recorded since enable().
+
+    A counter bumped inside spans is added to each open span of the thread
+    as well as to the run's totals, so an asset's span carries the
+    elements and bytes of everything drawn for it.
+    """
+
+    def __init__(self, path=TRACE):
+        self.path = path
+        self.pid = os.getpid()
+        self.t0 = time.perf_counter_ns()
+        self.events = []
+        self.counters = Counter()
+        self._local = threading.local()
+
+    def stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+
+def enable(path=TRACE):
+    """Start profiling; the trace and summary are written at exit."""
+    global _profile, _reporting
+    if not _reporting:
+        atexit.register(_report)
+        _reporting = True
+    _profile = Profile(path)
+    return _profile
+
+
+def disable():
+    """Stop profiling; return the Profile recorded so far (or None)."""
+    global _profile
+    profile, _profile = _profile, None
+    return profile
+
+
+def enabled():
+    return _profile is not None
+
+
+def span(name, cat="stage", **args):
+    """Context manager timing one stage; `args` go into the trace."""
+    if _profile is None:
+        return _NULL
+    return _Span(_profile, name, cat, args)
+
+
+def count(name, n=1):
+    """Add `n` to counter `name` of the run and of every open span."""
+    if _profile is None:
+        return
+    _profile.counters[name] += n
+    for s in _profile.stack():
+        s.counters[name] += n
+
+
+def chrome_trace(profile):
+    """The profile in Chrome's trace-event format (chrome://tracing, Perfetto)."""
+    events = [
+        dict(
+            name=e["name"],
+            cat=e["cat"],
+            ph="X",
+            ts=(e["start"] - profile.t0) / 1e3,
+            dur=e["dur"] / 1e3,
+            pid=profile.pid,
+            tid=e["tid"],
+            args={**e["args"], **e["counters"]},
+        )
+        for e in profile.events
+    ]
+    return dict(
+        traceEvents=events,
+        displayTimeUnit="ms",
+        otherData=dict(counters=dict(profile.counters)),
+    )
+
+
+def summary(profile):
+    """Text report: time per stage, then time and counters per asset."""
+    stages = {}
+    for e in profile.events:
+        row = stages.setdefault((e["cat"], e["name"]), [0, 0, 0])
+        row[0] += 1
+        row[1] += e["dur"]
+        row[2] += e["self"]
+    lines = [f"{'stage':<40} {'calls':>6} {'total ms':>10} {'self ms':>10}"]
+    for (cat, name), (calls, total, own) in sorted(
+        stages.items(), key=lambda item: -item[1][2]
+    ):
+        if cat == "asset":
+            continue
+        label = f"{cat}:{name}"[:40]
+        lines.append(f"{label:<40} {calls:>6} {total / 1e6:>10.2f} {own / 1e6:>10.2f}")
+
+    assets = [e for e in profile.events if e["cat"] == "asset"]
+    if assets:
+        keys = sorted({k for e in assets for k in e["counters"]})
+        lines += ["", f"{'asset':<30} {'ms':>8}" + "".join(f" {k:>14}" for k in keys)]
+        for e in sorted(assets, key=lambda e: e["start"]):
+            cells = "".join(f" {e['counters'].get(k, 0):>14,}" for k in keys)
+            lines.append(f"{e['name'][:30]:<30} {e['dur'] / 1e6:>8.2f}{cells}")
+
+    if profile.counters:
+        lines.append("")
+        for name, n in sorted(profile.counters.items()):
+            lines.append(f"{name:<30} {n:>12,}")
+    return "\n".join(lines)
+
+
+def write_report(profile, path=None, stream=None):
+    """Write the Chrome trace to `path` and the summary to `stream`."""
+    path = path or profile.path
+    with open(path, "w") as f:
+        json.dump(chrome_trace(profile), f)
+    stream = stream or sys.stderr
+    print(summary(profile), file=stream)
+    print(f"Trace written to {path}", file=stream)
+
+
+def _report():
+    profile = disable()
+    # Forked workers inherit the profile; only the process that enabled it
+    # reports.
+    if profile is not None and profile.pid == os.getpid():
+        write_report(profile)
+
+
+if os.environ.get(ENV):
+    enable(TRACE if os.environ[ENV] == "1" else os.environ[ENV])
@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+
+# Isometric axes: 30° from horizontal
+ANG = math.radians(30)
+
+
+def camera(ang=ANG):
+    """Return the 3x3 camera matrix for an isometric view at `ang`.
+
+    Rows are the model x, y and z axes. The first two columns are their
+    projected 2D directions; the third is depth along the view direction
+    (larger is further from the viewer).
+    """
+    c, s = math.cos(ang), math.sin(ang)
+    k = 1 / math.sqrt(3)
+    return np.array(
+        [
+            [c, -s, k],  # x-axis projects right and up
+            [-c, -s, k],  # y-axis projects left and up
+            [0, -1, -k],  # z-axis projects straight up
+        ]
+    )
+
+
+ISO = camera()
+
+
+def project(points, cam=ISO):
+    """Project an (N, 3) array of model points to (N, 2) screen points."""
+    return np.asarray(points, dtype=float) @ cam[:, :2]
+
+
+def depth(points, cam=ISO):
+    """Depth of an (N, 3) array of model points along the view direction."""
+    return np.asarray(points, dtype=float) @ cam[:, 2]
+
+
+# Visible corners of an axis-aligned box, in the order returned by box():
+# f/b = front (y=y0) / back, t/b = top / bottom, l/r = left (x=x0) / right.
+CORNERS = ("fbl", "fbr", "bbl", "ftl", "ftr", "btl", "btr")
+_CORNER_SEL = np.array(
+    [
+        [0, 0, 0],
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 0, 1],
+        [0, 1, 1],
+        [1, 1, 1],
+    ],
+    dtype=bool,
+)
+
+
+def box(x0, y0, z0, x1, y1, z1, cam=ISO):
+    """Project the 7 visible corners of a box as a (7, 2) array."""
+    pts = np.where(_CORNER_SEL, (x1, y1, z1), (x0, y0, z0))
+    return project(pts, cam)
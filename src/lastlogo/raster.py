@@ -0,0 +1,223 @@
+import io
+from functools import partial
+from pathlib import Path
+
+from .backend import BACKEND
+from .emit import PRECISION
+from .incremental import build
+from .profiling import span
+from .template import THEMES
+
+# Raster formats rasterize() and raster_set() can produce.
+RASTER_FORMATS = ("png", "webp", "ico")
+# Formats encode_animation() can produce.
+ANIMATED_FORMATS = ("apng", "gif", "webp")
+
+# Frames stored in a favicon .ico, and the square app-icon PNGs.
+ICO_SIZES = (16, 32, 48)
+APP_SIZES = (180, 192, 512)
+# Largest frame the ICO format can hold.
+ICO_MAX = 256
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+
+def render(svg, width=None):
+    """Rasterize SVG bytes once, `width` px wide, to an RGBA Pillow image.
+
+    cairosvg and Pillow are imported here, so SVG-only runs never load
+    them.
+    """
+    import cairosvg
+    from PIL import Image
+
+    with span("cairosvg", "raster"):
+        png = cairosvg.svg2png(bytestring=svg, output_width=width)
+    return Image.open(io.BytesIO(png)).convert("RGBA")
+
+
+def square(im):
+    """`im` centred on a transparent square canvas."""
+    from PIL import Image
+
+    side = max(im.size)
+    if im.width == im.height:
+        return im
+    out = Image.new("RGBA", (side, side))
+    out.paste(im, ((side - im.width) // 2, (side - im.height) // 2))
+    return out
+
+
+def pyramid(master, widths):
+    """Downsample `master` to each of `widths`; return {width: image}.
+
+    The master is halved with a 2x2 box filter until the next halving
+    would undershoot, and each size then takes a single Lanczos step of
+    less than 2x from the level above it. Filtering is done on
+    premultiplied alpha so transparent edges don't darken.
+    """
+    from PIL import Image
+
+    out = {}
+    with span("pyramid", "raster", widths=len(widths)):
+        levels = [master.convert("RGBa")]
+        for width in sorted(set(widths), reverse=True):
+            while levels[-1].width >= 2 * width:
+                levels.append(levels[-1].reduce(2))
+            base = levels[-1]
+            height = max(1, round(master.height * width / master.width))
+            if base.size != (width, height):
+                base = base.resize((width, height), Image.LANCZOS)
+            out[width] = base.convert("RGBA")
+    return out
+
+
+def encode(im, fmt):
+    """Encode one Pillow image as PNG or WebP bytes."""
+    buf = io.BytesIO()
+    with span(fmt, "encode"):
+        if fmt == "png":
+            im.save(buf, "PNG")
+        elif fmt == "webp":
+            im.save(buf, "WEBP", lossless=True)
+        else:
+            raise ValueError(f"unknown raster format {fmt!r}")
+    return buf.getvalue()
+
+
+def encode_ico(frames):
+    """Pack square `frames` (largest first) into one .ico file."""
+    buf = io.BytesIO()
+    with span("ico", "encode"):
+        frames[0].save(
+            buf,
+            "ICO",
+            sizes=[im.size for im in frames],
+            append_images=frames[1:],
+        )
+    return buf.getvalue()
+
+
+def encode_animation(frames, fmt, fps, loop=0):
+    """Encode RGBA `frames` as one looping APNG, GIF or WebP animation."""
+    if fmt not in ANIMATED_FORMATS:
+        raise ValueError(f"unknown animation format {fmt!r}")
+    buf = io.BytesIO()
+    opts = dict(save_all=True, append_images=frames[1:], loop=loop)
+    duration = round(1000 / fps)
+    with span(fmt, "encode", frames=len(frames)):
+        if fmt == "apng":
+            frames[0].save(buf, "PNG", duration=duration, **opts)
+        elif fmt == "gif":
+            # Each frame replaces the last rather than painting over it
+            frames[0].save(buf, "GIF", duration=duration, disposal=2, **opts)
+        else:
+            frames[0].save(buf, "WEBP", duration=duration, lossless=True, **opts)
+    return buf.getvalue()
+
+
+def raster_set(svg, outputs, native_width=None, square_all=False):
+    """Encode every (width, fmt) of `outputs` from one rasterization.
+
+    A width of None means `native_width`. "ico" entries make one icon
+    holding a square frame for each of their widths, at most ICO_MAX. With
+    `square_all`, PNG and WebP output is squared as well, for app icons.
+    Returns bytes aligned with `outputs`.
+
+    `svg` may instead be a function of the pixel width that returns the
+    RGBA master image, such as a paint.paint_image() partial; the drawing
+    is then painted directly, with no SVG to serialize and parse.
+    """
+    outputs = [(width or native_width, fmt) for width, fmt in outputs]
+    for _, fmt in outputs:
+        if fmt not in RASTER_FORMATS:
+            raise ValueError(f"unknown raster format {fmt!r}")
+    ico = [w for w, fmt in outputs if fmt == "ico"]
+    if any(w > ICO_MAX for w in ico):
+        raise ValueError(f"ICO frames are at most {ICO_MAX} px, got {max(ico)}")
+    width = max(w for w, _ in outputs)
+    master = svg(width) if callable(svg) else render(svg, width)
+
+    flat = [w for w, fmt in outputs if fmt != "ico"]
+    images = {}
+    if flat:
+        images = pyramid(square(master) if square_all else master, flat)
+    frames = pyramid(square(master), ico) if ico else {}
+
+    data, ico_bytes = [], None
+    for width, fmt in outputs:
+        if fmt != "ico":
+            data.append(encode(images[width], fmt))
+            continue
+        if ico_bytes is None:
+            ico_bytes = encode_ico([frames[w] for w in sorted(frames, reverse=True)])
+        data.append(ico_bytes)
+    return data
+
+
+def rasterize(svg, fmt="png", width=None):
+    """Rasterize SVG bytes to a single `fmt` image, `width` px wide if given."""
+    if fmt == "ico":
+        return raster_set(svg, [(w, "ico") for w in ICO_SIZES])[0]
+    return encode(render(svg, width), fmt)
+
+
+def artifacts(
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    themes=THEMES,
+    painter=None,
+    outline=False,
+):
+    """A favicon .ico and square app-icon PNGs for each theme.
+
+    Each theme's whole set comes from a single rasterization of the icon,
+    or a single direct painting of it with `painter` (see paint.py).
+    """
+    from .icon import icon_drawing, icon_template
+
+    outputs = [(w, "ico") for w in ICO_SIZES] + [(w, "png") for w in APP_SIZES]
+    for theme, colours in themes.items():
+
+        def render(colours=colours):
+            if painter:
+                from .paint import paint_image
+
+                source = partial(
+                    paint_image,
+                    icon_drawing,
+                    painter=painter,
+                    outline=outline,
+                    **colours,
+                )
+            else:
+                tpl = icon_template(precision, backend, symbols, outline)
+                source = tpl.render(**colours)
+            data = raster_set(source, outputs, square_all=True)
+            # Every ICO entry is the same file
+            return [data[0], *data[len(ICO_SIZES) :]]
+
+        names = [f"favicon-{theme}.ico"]
+        names += [f"app-icon-{theme}-{w}.png" for w in APP_SIZES]
+        params = dict(
+            colours=colours,
+            precision=precision,
+            backend=backend,
+            symbols=symbols,
+            painter=painter,
+            outline=outline,
+        )
+        yield tuple(names), params, render
+
+
+def main(
+    out_dir=OUTPUT_DIR,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    painter=None,
+    outline=False,
+):
+    tasks = artifacts(precision, backend, symbols, painter=painter, outline=outline)
+    build(__name__, tasks, out_dir)
@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import os
+import re
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from urllib.parse import parse_qsl, urlsplit
+
+from .batch import ASSETS, _drawing, _template, _warm
+from .incremental import fingerprint
+from .paint import PAINTERS
+from .raster import ICO_SIZES
+from .template import SLOTS, THEMES
+
+CONTENT_TYPES = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "webp": "image/webp",
+    "ico": "image/x-icon",
+}
+# Largest raster width served, to bound per-request work.
+MAX_SIZE = 4096
+# Rendered responses kept in memory.
+CACHE_BYTES = 64 << 20
+# Colours accepted in the query: #rgb[a], #rrggbb[aa] or a CSS colour name.
+_HEX_RE = re.compile(r"#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
+
+def valid_colour(colour):
+    """Whether `colour` is a hex colour, "none" or a CSS colour name."""
+    if _HEX_RE.fullmatch(colour) or colour == "none":
+        return True
+    from PIL import ImageColor
+
+    return colour.lower() in ImageColor.colormap
+
+
+class HTTPError(Exception):
+    def __init__(self, status, reason, headers=None):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+
+
+class ResponseCache:
+    """LRU of rendered bodies, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        body = self._data.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        if key in self._data:
+            self.size -= len(self._data.pop(key))
+        self._data[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, old = self._data.popitem(last=False)
+            self.size -= len(old)
+
+
+def parse_variant(path, query):
+    """Map /{asset}.{format}?theme=&fg=&bg=&accent=&size= to a variant.
+
+    Returns (asset, fmt, colours, size); raises HTTPError(404/400).
+    """
+    name, _, fmt = path.lstrip("/").rpartition(".")
+    if name not in ASSETS or fmt not in CONTENT_TYPES:
+        raise HTTPError(404, "Not Found")
+    params = dict(query)
+    theme = params.get("theme", "light")
+    if theme not in THEMES:
+        raise HTTPError(400, f"unknown theme {theme!r}")
+    colours = dict(THEMES[theme])
+    for slot in SLOTS:
+        if slot in params:
+            if not valid_colour(params[slot]):
+                raise HTTPError(400, f"{slot} must be a hex colour or a colour name")
+            colours[slot] = params[slot]
+    size = None
+    if "size" in params and fmt != "svg":
+        try:
+            size = int(params["size"])
+        except ValueError:
+            raise HTTPError(400, "size must be an integer") from None
+        if not 0 < size <= MAX_SIZE:
+            raise HTTPError(400, f"size must be 1..{MAX_SIZE}")
+    return name, fmt, colours, size
+
+
+def render_raster(asset, colours, size, fmt, painter=None):
+    """Worker-side: rasterize one variant from the warm asset template.
+
+    With a `painter`, the asset is painted directly instead (see paint.py).
+    """
+    from .raster import raster_set
+
+    tpl = _template(asset, {})
+    source = tpl.render(**colours)
+    if painter:
+        from .paint import paint_image
+
+        source = partial(paint_image, _drawing(asset), painter=painter, **colours)
+    outputs = [(w, "ico") for w in ICO_SIZES] if fmt == "ico" else [(size, fmt)]
+    return raster_set(source, outputs, native_width=round(tpl.size[0]))[0]
+
+
+class LogoServer:
+    """Render logo variants on demand over HTTP/1.1.
+
+    SVGs are template substitutions and are rendered inline; rasters go to
+    a process pool. At most `max_pending` rasters may be queued or running;
+    beyond that requests get 503 instead of piling up. Identical requests
+    in flight share one render. ETags are derived from the variant's
+    fingerprint (generator source + parameters), so conditional GETs are
+    answered without rendering anything. With a `painter`, rasters are
+    painted directly rather than rasterized from the SVG.
+    """
+
+    def __init__(
+        self, workers=None, max_pending=None, cache_bytes=CACHE_BYTES, painter=None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.painter = painter
+        self.max_pending = max_pending or 4 * self.workers
+        self.pending = 0
+        self.cache = ResponseCache(cache_bytes)
+        self.inflight = {}
+        self.pool = None
+
+    def start_pool(self):
+        self.pool = ProcessPoolExecutor(
+            self.workers, initializer=_warm, initargs=(ASSETS, {})
+        )
+        for asset in ASSETS:
+            _template(asset, {})
+
+    async def render(self, key, asset, fmt, colours, size):
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+        if key in self.inflight:
+            return await asyncio.shield(self.inflight[key])
+        if fmt == "svg":
+            body = _template(asset, {}).render(**colours)
+        else:
+            if self.pending >= self.max_pending:
+                raise HTTPError(503, "Busy", {"Retry-After": "1"})
+            self.pending += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self.pool, render_raster, asset, colours, size, fmt, self.painter
+            )
+            self.inflight[key] = future
+            try:
+                body = await asyncio.shield(future)
+            finally:
+                self.pending -= 1
+                del self.inflight[key]
+        self.cache.put(key, body)
+        return body
+
+    async def respond(self, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            raise HTTPError(405, "Method Not Allowed", {"Allow": "GET, HEAD"})
+        url = urlsplit(target)
+        asset, fmt, colours, size = parse_variant(url.path, parse_qsl(url.query))
+        name = f"{asset}.{fmt}"
+        modules, params = (asset, "batch", "raster"), [colours, size]
+        if self.painter and fmt != "svg":
+            modules, params = modules + ("paint",), params + [self.painter]
+        key = fingerprint(modules, [name], params)
+        etag = f'"{key[:32]}"'
+        common = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=86400",
+        }
+        match = headers.get("if-none-match", "")
+        if etag in [t.strip() for t in match.split(",")] or match.strip() == "*":
+            return 304, common, b""
+        body = await self.render(key, asset, fmt, colours, size)
+        common["Content-Type"] = CONTENT_TYPES[fmt]
+        return 200, common, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                method, target, version = request.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    status, extra, body = await self.respond(method, target, headers)
+                    reason = "OK" if status == 200 else "Not Modified"
+                except HTTPError as e:
+                    status, reason, extra = e.status, e.reason, e.headers
+                    body = (e.reason + "\n").encode()
+                    extra.setdefault("Content-Type", "text/plain")
+                except Exception:
+                    traceback.print_exc()
+                    status, reason, extra = 500, "Internal Server Error", {}
+                    body = b"Internal Server Error\n"
+                    extra["Content-Type"] = "text/plain"
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1"
+                )
+                head = [f"HTTP/1.1 {status} {reason}"]
+                head += [f"{k}: {v}" for k, v in extra.items()]
+                head.append(f"Content-Length: {len(body)}")
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        self.start_pool()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving on http://{host}:{port}/ ({self.workers} raster workers)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.server",
+        description="Serve logos, e.g. /logo.svg?theme=dark or /icon.png?size=64",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-j", "--workers", type=int, help="raster processes")
+    parser.add_argument("--max-pending", type=int, help="queued rasters before 503")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_BYTES >> 20)
+    parser.add_argument(
+        "--painter", choices=sorted(PAINTERS), help="paint rasters directly"
+    )
+    args = parser.parse_args(argv)
+    server = LogoServer(
+        args.workers, args.max_pending, args.cache_mb << 20, args.painter
+    )
+    t0 = time.perf_counter()
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"Stopped after {time.perf_counter() - t0:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import io
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+from .profiling import count, span
+
+# Fixed timestamp of archive members, so the same files give the same archive.
+EPOCH = (1980, 1, 1, 0, 0, 0)
+# Already-compressed formats, stored rather than deflated in zips.
+STORED = (".png", ".webp", ".gif", ".ico", ".pdf")
+# Archive kinds by suffix, with their tarfile stream mode.
+TAR_MODES = {".tar": "w|", ".tar.gz": "w|gz", ".tgz": "w|gz", ".tar.xz": "w|xz"}
+
+
+class DirSink:
+    """Write each file into a directory, as the generators always have."""
+
+    def __init__(self, path):
+        self.dir = Path(path)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, name, data):
+        with span("write", "io", file=name):
+            (self.dir / name).write_bytes(data)
+        count("bytes_written", len(data))
+
+    def close(self):
+        pass
+
+
+class ZipSink:
+    """Stream files into a zip archive on a binary `stream` as they arrive.
+
+    Each member is written and forgotten, so memory doesn't grow with the
+    archive. The stream need not be seekable (stdout, a socket). With
+    `owned`, close() closes the stream too.
+    """
+
+    def __init__(self, stream, owned=False):
+        self.stream = stream
+        self.owned = owned
+        self.zip = zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED)
+
+    def write(self, name, data):
+        info = zipfile.ZipInfo(name, EPOCH)
+        info.external_attr = 0o644 << 16
+        stored = name.lower().endswith(STORED)
+        info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+        with span("zip", "io", file=name):
+            self.zip.writestr(info, data)
+        count("bytes_written", len(data))
+
+    def close(self):
+        self.zip.close()
+        _release(self.stream, self.owned)
+
+
+class TarSink:
+    """Stream files into a tar archive on a binary `stream`.
+
+    `mode` is a tarfile stream mode: "w|" (plain) or "w|gz", "w|xz".
+    """
+
+    def __init__(self, stream, mode="w|", owned=False):
+        self.stream = stream
+        self.owned = owned
+        self.tar = tarfile.open(fileobj=stream, mode=mode)
+
+    def write(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = 0o644
+        with span("tar", "io", file=name):
+            self.tar.addfile(info, io.BytesIO(data))
+        count("bytes_written", len(data))
+
+    def close(self):
+        self.tar.close()
+        _release(self.stream, self.owned)
+
+
+class MemorySink:
+    """Keep every file in `files` ({name: bytes}), e.g. for tests or servers."""
+
+    def __init__(self):
+        self.files = {}
+
+    def write(self, name, data):
+        self.files[name] = data
+        count("bytes_written", len(data))
+
+    def close(self):
+        pass
+
+
+class StdoutSink:
+    """Write the bytes of a single file to stdout, e.g. to pipe one SVG.
+
+    Several files would run together, so a second one is an error; stream
+    an archive to stdout (zip:- or tar:-) instead.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout.buffer
+        self.name = None
+
+    def write(self, name, data):
+        if self.name is not None:
+            raise ValueError(
+                f"can't write {name} after {self.name} to stdout; use zip:- or tar:-"
+            )
+        self.name = name
+        self.stream.write(data)
+        count("bytes_written", len(data))
+
+    def close(self):
+        self.stream.flush()
+
+
+def _release(stream, owned):
+    if owned:
+        stream.close()
+    else:
+        stream.flush()
+
+
+def _archive(kind, stream, owned=False):
+    if kind == ".zip":
+        return ZipSink(stream, owned)
+    return TarSink(stream, TAR_MODES[kind], owned)
+
+
+def _kind(name):
+    name = name.lower()
+    for kind in (".zip", *TAR_MODES):
+        if name.endswith(kind):
+            return kind
+    return None
+
+
+def open_sink(dest):
+    """A sink for `dest`: a sink itself, a directory, an archive path or "-".
+
+    Paths ending in .zip, .tar, .tar.gz, .tgz or .tar.xz become archives;
+    "zip:-" and "tar:-" (or "tar.gz:-") stream one to stdout, and "-"
+    writes a single file to stdout. Anything else is a directory.
+    """
+    if hasattr(dest, "write"):
+        return dest
+    dest = str(dest)
+    if dest == "-":
+        return StdoutSink()
+    if dest.endswith(":-"):
+        kind = "." + dest[:-2]
+        if kind != ".zip" and kind not in TAR_MODES:
+            raise ValueError(f"unknown archive kind {dest[:-2]!r}")
+        return _archive(kind, sys.stdout.buffer)
+    kind = _kind(dest)
+    if kind is None:
+        return DirSink(dest)
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    return _archive(kind, open(dest, "wb"), owned=True)
+
+
+def writes_stdout(dest):
+    """Whether open_sink(`dest`) writes to stdout, so logs must go elsewhere."""
+    return str(dest) == "-" or str(dest).endswith(":-")
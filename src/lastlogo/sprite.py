@@ -0,0 +1,278 @@
+import argparse
+import hashlib
+import json
+import math
+import re
+from pathlib import Path
+
+from .batch import GENERATORS, svg_artifacts
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+# Base name of the atlas PNG, SVG sprite, JSON map and stylesheet.
+SHEET = "sprites"
+# Sheet width in CSS px (widened for a wider sprite) and the gap between
+# sprites, so filtering never bleeds a neighbour in.
+WIDTH = 1024
+GAP = 2
+# Bump when the map layout changes.
+MAP_VERSION = 1
+
+_SVG_TAG_RE = re.compile(rb"<svg\b([^>]*)>")
+_ATTR_RE = re.compile(rb'([\w:-]+)="([^"]*)"')
+# An id, or a same-document reference to one (href or xlink:href).
+_ID_RE = re.compile(rb'\b(id="|href="#)')
+
+
+def svg_size(svg):
+    """(width, height) of an SVG document, from its root element."""
+    attrs = dict(_ATTR_RE.findall(_SVG_TAG_RE.search(svg).group(1)))
+    return float(attrs[b"width"]), float(attrs[b"height"])
+
+
+def svg_body(svg):
+    """The content of an SVG document's root element."""
+    start = _SVG_TAG_RE.search(svg).end()
+    return svg[start : svg.rindex(b"</svg>")]
+
+
+def namespace_ids(body, prefix):
+    """`body` with every id, and every local href to one, prefixed by `prefix`.
+
+    Ids such as a symbol's s0 are only unique within their own document, so
+    sprites nested in one sheet each get their own namespace.
+    """
+    return _ID_RE.sub(lambda m: m.group(1) + prefix, body)
+
+
+def _fits(x, y, w, h, placed, width):
+    if x + w > width:
+        return False
+    return all(
+        x >= px + pw + GAP
+        or px >= x + w + GAP
+        or y >= py + ph + GAP
+        or py >= y + h + GAP
+        for px, py, pw, ph in placed
+    )
+
+
+def place(w, h, placed, width=WIDTH):
+    """Lowest, then leftmost, free (x, y) for a w x h sprite.
+
+    Candidates are the origin and the points just right of and just below
+    each placed (x, y, w, h) rect, so holes left by removed sprites are
+    reused before the sheet grows.
+    """
+    candidates = {(0, 0)}
+    for px, py, pw, ph in placed:
+        candidates |= {(px + pw + GAP, py), (px, py + ph + GAP), (0, py + ph + GAP)}
+    for x, y in sorted(candidates, key=lambda p: (p[1], p[0])):
+        if _fits(x, y, w, h, placed, width):
+            return x, y
+    raise AssertionError("unreachable: below every rect is free")
+
+
+def pack(sizes, previous=None, width=WIDTH):
+    """Place sprites of {name: (w, h)} on a sheet `width` px wide.
+
+    Sprites found in the `previous` layout ({name: {x, y, w, h}}) with the
+    same size keep their place; only new or resized ones are placed, tallest
+    first, into the space left. Returns {name: (x, y, w, h)}.
+    """
+    previous = previous or {}
+    layout = {}
+    for name, (w, h) in sizes.items():
+        old = previous.get(name)
+        if old and (old["w"], old["h"]) == (w, h) and old["x"] + w <= width:
+            layout[name] = (old["x"], old["y"], w, h)
+    new = sorted(
+        (name for name in sizes if name not in layout),
+        key=lambda name: (-sizes[name][1], -sizes[name][0], name),
+    )
+    for name in new:
+        w, h = sizes[name]
+        layout[name] = (*place(w, h, list(layout.values()), width), w, h)
+    return dict(sorted(layout.items()))
+
+
+def sheet_size(layout, width=WIDTH):
+    """(width, height) of the sheet holding every rect of `layout`."""
+    height = max((y + h for _, y, _, h in layout.values()), default=0)
+    return width, height
+
+
+def sprite_svg(sprites, layout, size):
+    """One SVG holding every sprite at its atlas position.
+
+    Each sprite is a nested <svg id=name>, so <use href="sprites.svg#name">
+    draws it alone, and a <view id="view-name"> lets "sprites.svg#view-name"
+    show just that sprite as an image. Ids inside a sprite, such as its
+    symbols, are prefixed with "name-".
+    """
+    out = [b'<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d">' % size]
+    for name, (x, y, w, h) in layout.items():
+        sw, sh = svg_size(sprites[name])
+        out.append(
+            b'<view id="view-%s" viewBox="%d %d %d %d"/>' % (name.encode(), x, y, w, h)
+        )
+        out.append(
+            b'<svg id="%s" x="%d" y="%d" width="%r" height="%r">'
+            % (name.encode(), x, y, sw, sh)
+        )
+        out.append(namespace_ids(svg_body(sprites[name]), name.encode() + b"-"))
+        out.append(b"</svg>")
+    out.append(b"</svg>\n")
+    return b"".join(out)
+
+
+def sprite_css(layout, size, image):
+    """Stylesheet with one `.sprite-name` class per sprite of the atlas."""
+    lines = [
+        ".sprite{background:url(%s) no-repeat;background-size:%dpx %dpx;"
+        "display:inline-block}" % (image, *size)
+    ]
+    for name, (x, y, w, h) in layout.items():
+        lines.append(
+            f".sprite-{name}{{width:{w}px;height:{h}px;"
+            f"background-position:{-x}px {-y}px}}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def atlas(sprites, layout, size, scale=1, previous=None, previous_png=None):
+    """Rasterize the sprites into one RGBA atlas, `scale` px per CSS px.
+
+    With the `previous` map and its atlas image, sprites whose place and
+    SVG digest are unchanged keep their pixels, so only new, moved or
+    changed sprites are rasterized. Returns (image, rasterized names).
+    """
+    from PIL import Image
+
+    from .raster import render
+
+    digests = {name: _digest(svg) for name, svg in sprites.items()}
+    px = (size[0] * scale, size[1] * scale)
+    kept = set()
+    image = Image.new("RGBA", px)
+    reuse = previous and previous.get("image") and previous.get("scale") == scale
+    if reuse and previous_png and Path(previous_png).exists():
+        old = previous["sprites"]
+        base = Image.open(previous_png).convert("RGBA")
+        image.paste(base.crop((0, 0, *px)), (0, 0))
+        kept = {
+            name
+            for name, (x, y, w, h) in layout.items()
+            if old.get(name) == dict(x=x, y=y, w=w, h=h, digest=digests[name])
+        }
+        # Clear whatever moved, changed or went away
+        for name, e in old.items():
+            if name not in kept:
+                box = (e["x"], e["y"], e["x"] + e["w"], e["y"] + e["h"])
+                image.paste((0, 0, 0, 0), tuple(v * scale for v in box))
+
+    drawn = []
+    for name, (x, y, w, h) in layout.items():
+        if name in kept:
+            continue
+        im = render(sprites[name], round(svg_size(sprites[name])[0] * scale))
+        # Rounding may add a row; never spill into the gap
+        image.paste(im.crop((0, 0, w * scale, h * scale)), (x * scale, y * scale))
+        drawn.append(name)
+    return image, drawn
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def build_sheet(sprites, out_dir=OUTPUT_DIR, width=WIDTH, scale=1, png=True):
+    """Pack {name: svg bytes} into the atlas, sprite, map and stylesheet.
+
+    The layout of the map already in `out_dir` is kept where possible.
+    Returns (sheet size, names rasterized into the atlas).
+    """
+    out_dir = Path(out_dir)
+    map_path = out_dir / f"{SHEET}.json"
+    png_path = out_dir / f"{SHEET}.png"
+    previous = None
+    if map_path.exists():
+        previous = json.loads(map_path.read_text())
+        if previous.get("version") != MAP_VERSION:
+            previous = None
+
+    sizes = {
+        name: tuple(math.ceil(v) for v in svg_size(svg))
+        for name, svg in sprites.items()
+    }
+    layout = pack(sizes, previous and previous["sprites"], width)
+    size = sheet_size(layout, width)
+
+    drawn = []
+    if png:
+        image, drawn = atlas(
+            sprites,
+            layout,
+            size,
+            scale,
+            previous,
+            png_path,
+        )
+        image.save(png_path, "PNG", optimize=True)
+    svg_path = out_dir / f"{SHEET}.svg"
+    svg_path.write_bytes(sprite_svg(sprites, layout, size))
+    # Without the atlas, the stylesheet draws from the SVG sprite
+    image = png_path if png else svg_path
+    (out_dir / f"{SHEET}.css").write_bytes(sprite_css(layout, size, image.name))
+    entries = {
+        name: dict(x=x, y=y, w=w, h=h, digest=_digest(sprites[name]))
+        for name, (x, y, w, h) in layout.items()
+    }
+    sheet = dict(
+        version=MAP_VERSION,
+        width=size[0],
+        height=size[1],
+        scale=scale,
+        # None once the atlas no longer matches the layout
+        image=png_path.name if png else None,
+        sprites=entries,
+    )
+    map_path.write_text(json.dumps(sheet, indent=1) + "\n")
+    return size, drawn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.sprite",
+        description="Pack every logo variant into one PNG atlas and SVG sprite.",
+    )
+    parser.add_argument("-o", "--out-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--width", type=int, default=WIDTH, help="sheet width in px")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="atlas px per CSS px, e.g. 2 for HiDPI"
+    )
+    parser.add_argument(
+        "--no-png", action="store_true", help="write the SVG sprite and maps only"
+    )
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        help="write repeated shapes once as <symbol>s",
+    )
+    args = parser.parse_args(argv)
+
+    sprites = {
+        name.removesuffix(".svg"): svg
+        for name, svg in svg_artifacts(GENERATORS, symbols=args.symbols)
+    }
+    width = max(args.width, *(math.ceil(svg_size(s)[0]) for s in sprites.values()))
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    size, drawn = build_sheet(sprites, args.out_dir, width, args.scale, not args.no_png)
+    status = f"Packed {len(sprites)} sprites into {size[0]}x{size[1]}"
+    if not args.no_png:
+        status += f" ({len(drawn)} rasterized, {len(sprites) - len(drawn)} kept)"
+    print(status)
+
+
+if __name__ == "__main__":
+    main()
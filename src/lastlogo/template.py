@@ -0,0 +1,62 @@
+import inspect
+import io
+import re
+from xml.sax.saxutils import escape
+
+from .profiling import span
+
+# Named colour slots an asset may expose.
+SLOTS = ("fg", "bg", "accent")
+_SLOT_RE = re.compile(r"\{(%s)\}" % "|".join(SLOTS))
+
+# Palettes every asset is built in by default.
+THEMES = {
+    "light": dict(fg="black", bg="white"),
+    "dark": dict(fg="white", bg="black"),
+}
+
+
+class Template:
+    """A pre-serialized SVG with named colour slots.
+
+    The SVG is split once at its slot markers; render() only interleaves
+    the cached byte chunks with the palette colours.
+    """
+
+    def __init__(self, svg, size, defaults=None):
+        parts = _SLOT_RE.split(svg)
+        self.chunks = [p.encode() for p in parts[0::2]]
+        self.slots = parts[1::2]
+        self.used = set(self.slots)
+        self.size = size
+        self.defaults = defaults or {}
+
+    def render(self, **colours):
+        """Return the SVG bytes with every slot filled from `colours`.
+
+        Slots missing from `colours` take the asset's default colour.
+        """
+        colours = {**self.defaults, **colours}
+        values = {
+            slot: escape(colours[slot], {'"': "&quot;"}).encode() for slot in self.used
+        }
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            out.append(values[slot])
+            out.append(chunk)
+        return b"".join(out)
+
+
+def compile_template(build):
+    """Compile `build(stream, fg=..., bg=..., accent=...)` to a Template.
+
+    `build` must draw the asset to the text `stream` and return its
+    (width, height); it is called once with slot markers in place of
+    colours.
+    """
+    buf = io.StringIO()
+    with span("compile", "template"):
+        size = build(buf, **{slot: "{%s}" % slot for slot in SLOTS})
+    params = inspect.signature(build).parameters
+    defaults = {slot: params[slot].default for slot in SLOTS if slot in params}
+    return Template(buf.getvalue(), size, defaults)
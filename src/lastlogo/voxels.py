@@ -0,0 +1,314 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from .projection import ISO, depth, project
+
+# Parts of the icon cube, front (teal) to back (white); a voxel of the
+# grid holds its part's index + 1, and 0 where it is empty.
+PARTS = ("teal", "black", "white")
+# The cube as a y-z section extruded along x: a row per z (top first), a
+# column per y (front first), each letter the initial of a part.
+CUBE_SECTION = (
+    "tbw",
+    "bbw",
+    "www",
+)
+# A face whose normal is this close to edge-on counts as facing away.
+EDGE_ON = 1e-9
+# Sides of the cube the icon shows, in the order of its L and notch faces:
+# (axis, sign) of the top (z=s), left (x=0) and front (y=0) normals.
+SIDES = ((2, 1), (0, -1), (1, -1))
+
+
+def cube_grid(section=CUBE_SECTION, parts=PARTS):
+    """The cube as an (n, n, n) array of part numbers, indexed [x, y, z]."""
+    initials = {name[0]: i + 1 for i, name in enumerate(parts)}
+    rows = [[initials[c] for c in row] for row in section[::-1]]
+    yz = np.array(rows).T  # [y, z], z counted from the bottom
+    return np.broadcast_to(yz, (yz.shape[0], *yz.shape)).copy()
+
+
+def facing(cam=ISO):
+    """(axis, sign) of the face normals turned towards the viewer."""
+    return [
+        (axis, sign)
+        for axis in range(3)
+        for sign in (1, -1)
+        if sign * cam[axis, 2] < -EDGE_ON
+    ]
+
+
+def _neighbour(mask, axis, sign):
+    """Whether each voxel's neighbour one step along `axis` is set."""
+    out = np.zeros_like(mask)
+    src, dst = [slice(None)] * 3, [slice(None)] * 3
+    src[axis], dst[axis] = (slice(1, None), slice(None, -1))[::sign]
+    out[tuple(dst)] = mask[tuple(src)]
+    return out
+
+
+def _lift(axis, plane, i, j):
+    """The lattice point at `plane` along `axis` and (i, j) along the others."""
+    point = [0, 0, 0]
+    point[axis], point[(axis + 1) % 3], point[(axis + 2) % 3] = plane, i, j
+    return tuple(point)
+
+
+def _loop(edges):
+    """Chain directed (start, end) edges into one closed boundary.
+
+    Edges met in both directions are interior and cancel. Returns the
+    corners in order, or None when what is left isn't a single simple loop
+    (a hole, or regions touching at a corner).
+    """
+    edges = set(edges)
+    after = {}
+    for a, b in edges:
+        if (b, a) in edges:
+            continue
+        if a in after:
+            return None
+        after[a] = b
+    if not after:
+        return None
+    start = next(iter(after))
+    loop = [start]
+    while (point := after[loop[-1]]) != start:
+        loop.append(point)
+    return loop if len(loop) == len(after) else None
+
+
+def _corners(loop, xy):
+    """`loop` without the points where it runs straight on, in `xy` terms."""
+    pts = [xy(p) for p in loop]
+    corners = []
+    for p, (x0, y0), (x, y), (x1, y1) in zip(
+        loop, pts[-1:] + pts, pts, pts[1:] + pts[:1]
+    ):
+        cross = (x0 - x) * (y1 - y) - (y0 - y) * (x1 - x)
+        if abs(cross) > 1e-9 * math.hypot(x0 - x, y0 - y) * math.hypot(x1 - x, y1 - y):
+            corners.append(p)
+    return corners
+
+
+def _cell_edges(i, j):
+    return [
+        ((i, j), (i + 1, j)),
+        ((i + 1, j), (i + 1, j + 1)),
+        ((i + 1, j + 1), (i, j + 1)),
+        ((i, j + 1), (i, j)),
+    ]
+
+
+def _rectangles(cells):
+    """Greedy meshing: cover `cells` with few maximal rectangles."""
+    todo = set(cells)
+    rects = []
+    for i, j in sorted(cells):
+        if (i, j) not in todo:
+            continue
+        j1 = j + 1
+        while (i, j1) in todo:
+            j1 += 1
+        i1 = i + 1
+        while all((i1, k) in todo for k in range(j, j1)):
+            i1 += 1
+        todo -= {(a, b) for a in range(i, i1) for b in range(j, j1)}
+        rects.append([(i, j), (i1, j), (i1, j1), (i, j1)])
+    return rects
+
+
+def _regions(labels):
+    """Merge the cells of a 2D label array into polygons of one label each.
+
+    Yields (label, corners, cells) per region: each 4-connected run of a
+    label becomes one polygon, or, if it has holes, the fewest rectangles
+    greedy meshing finds. `cells` lists the cells a polygon covers.
+    """
+    grid = labels.tolist()
+    todo_cells = {
+        (i, j): label
+        for i, row in enumerate(grid)
+        for j, label in enumerate(row)
+        if label
+    }
+    while todo_cells:
+        start, label = next(iter(todo_cells.items()))
+        del todo_cells[start]
+        cells, todo = [], deque([start])
+        while todo:
+            i, j = todo.popleft()
+            cells.append((i, j))
+            for n in ((i + 1, j), (i - 1, j), (i, j + 1), (i, j - 1)):
+                if todo_cells.get(n) == label:
+                    del todo_cells[n]
+                    todo.append(n)
+        loop = _loop(e for cell in cells for e in _cell_edges(*cell))
+        if loop is None:
+            for corners in _rectangles(cells):
+                cover = [
+                    (a, b)
+                    for a in range(corners[0][0], corners[2][0])
+                    for b in range(corners[0][1], corners[2][1])
+                ]
+                yield label, corners, cover
+        else:
+            yield label, _corners(loop, lambda p: p), cells
+
+
+def faces(grid, cam=ISO):
+    """Visible faces of the voxels of `grid`, merged into polygons.
+
+    `grid` holds a colour number per voxel (0 = empty). Faces turned away
+    from the viewer or against another voxel are culled; the rest merge
+    into one polygon per plane and colour wherever they connect, so the
+    polygon count is minimal by construction. Returns (polygon, colour,
+    (axis, sign)) triples, polygons as integer lattice corners, sorted back
+    to front by the depth of their centres for the painter's algorithm.
+    """
+    grid = np.asarray(grid)
+    solid = grid > 0
+    out = []
+    for axis, sign in facing(cam):
+        exposed = np.where(solid & ~_neighbour(solid, axis, sign), grid, 0)
+        plane_of = 1 if sign > 0 else 0
+        for layer in range(grid.shape[axis]):
+            labels = np.moveaxis(exposed, axis, 0)[layer]
+            # moveaxis keeps the other axes in order; _lift wants them cyclic
+            if axis == 1:
+                labels = labels.T
+            plane = layer + plane_of
+            for colour, corners, cells in _regions(labels):
+                poly = [_lift(axis, plane, i, j) for i, j in corners]
+                centre = np.mean(
+                    [_lift(axis, plane, i + 0.5, j + 0.5) for i, j in cells], axis=0
+                )
+                out.append((poly, colour, (axis, sign), depth([centre], cam)[0]))
+    out.sort(key=lambda f: -f[3])
+    return [(np.array(poly), colour, side) for poly, colour, side, _ in out]
+
+
+def _hidden(solid, points, cam):
+    """Whether a voxel of `solid` lies between each of `points` and the viewer."""
+    toward = -cam[:, 2] / np.abs(cam[:, 2]).max()
+    # Quarter steps offset by an eighth never land on a voxel boundary
+    ts = np.arange(0.125, sum(solid.shape), 0.25)
+    cells = np.floor(points[:, None] + ts[:, None] * toward).astype(int) + 1
+    cells = np.clip(cells, 0, np.array(solid.shape) + 1)
+    return np.pad(solid, 1)[tuple(np.moveaxis(cells, -1, 0))].any(axis=1)
+
+
+def edges(grid, cam=ISO):
+    """Visible outline and creases of the voxels of `grid` as lattice segments.
+
+    An edge of a visible face is stroked where the surface folds away from
+    the viewer across it: along the silhouette and convex creases, not
+    along concave ones or between coplanar faces. Edges covered by other
+    voxels are dropped and collinear pieces joined. Returns an (E, 2, 3)
+    integer array.
+    """
+    solid = np.asarray(grid) > 0
+    units = []
+    for axis, sign in facing(cam):
+        exposed = solid & ~_neighbour(solid, axis, sign)
+        for side in ((axis + 1) % 3, (axis + 2) % 3):
+            along = 3 - axis - side
+            for turn in (1, -1):
+                # Coplanar faces or a concave crease continue past the side
+                ends = exposed & ~_neighbour(solid, side, turn)
+                a = np.argwhere(ends)
+                a[:, axis] += sign > 0
+                a[:, side] += turn > 0
+                b = a.copy()
+                b[:, along] += 1
+                units.append(np.stack([a, b], axis=1))
+    units = np.concatenate(units)
+    units = units[~_hidden(solid, units.mean(axis=1), cam)]
+    return _join({(tuple(a), tuple(b)) for a, b in units.tolist()})
+
+
+def _join(units):
+    """Join axis-aligned unit segments that continue each other."""
+    lines = {}
+    for a, b in units:
+        along = next(k for k in range(3) if a[k] != b[k])
+        key = (along, *(a[k] for k in range(3) if k != along))
+        lines.setdefault(key, []).append(min(a[along], b[along]))
+    segments = []
+    for (along, *rest), starts in sorted(lines.items()):
+        starts.sort()
+        runs = [[starts[0], starts[0] + 1]]
+        for t in starts[1:]:
+            if t == runs[-1][1]:
+                runs[-1][1] = t + 1
+            else:
+                runs.append([t, t + 1])
+        for t0, t1 in runs:
+            ends = []
+            for t in (t0, t1):
+                p = list(rest)
+                p.insert(along, t)
+                ends.append(p)
+            segments.append(ends)
+    return np.array(_chain(segments), dtype=int).reshape(-1, 2, 3)
+
+
+def _chain(segments):
+    """Order and orient `segments` so each starts where the last ended, if
+    one can; chains start at odd-degree points, so they run long."""
+    ends = {}
+    for i, (a, b) in enumerate(segments):
+        ends.setdefault(tuple(a), []).append(i)
+        ends.setdefault(tuple(b), []).append(i)
+    todo = set(range(len(segments)))
+    odd = [p for p in sorted(ends) if len(ends[p]) % 2]
+    out = []
+    while todo:
+        starts = [p for p in odd if any(i in todo for i in ends[p])]
+        point = starts[0] if starts else tuple(segments[min(todo)][0])
+        while nxt := [i for i in ends[point] if i in todo]:
+            i = nxt[0]
+            todo.discard(i)
+            a, b = map(tuple, segments[i])
+            if a != point:
+                a, b = b, a
+            out.append((a, b))
+            point = b
+    return out
+
+
+def outline(grid, region, cam=ISO):
+    """Screen outline of the visible faces of `region` within `grid`.
+
+    `region` masks the voxels whose faces count; `grid` is everything that
+    can hide them. Returns the corners (lattice points) of the one polygon
+    covering those faces on screen.
+    """
+    solid = np.asarray(grid) > 0
+    region = np.asarray(region, dtype=bool)
+    boundary = []
+    for axis, sign in facing(cam):
+        exposed = region & solid & ~_neighbour(solid, axis, sign)
+        plane = 1 if sign > 0 else 0
+        square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+        pts = project([_lift(axis, 0, i, j) for i, j in square], cam)
+        if _area(pts) < 0:
+            square = square[::-1]
+        for v in zip(*np.nonzero(exposed)):
+            i, j = v[(axis + 1) % 3], v[(axis + 2) % 3]
+            ring = [
+                _lift(axis, int(v[axis]) + plane, int(i + a), int(j + b))
+                for a, b in square
+            ]
+            boundary += zip(ring, ring[1:] + ring[:1])
+    loop = _loop(boundary)
+    if loop is None:
+        raise ValueError("region has no single outline on screen")
+    return np.array(_corners(loop, lambda p: project([p], cam)[0]))
+
+
+def _area(pts):
+    x, y = np.asarray(pts).T
+    return 0.5 * (x @ np.roll(y, -1) - y @ np.roll(x, -1))
@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import importlib
+import json
+import sys
+import time
+import traceback
+
+from . import incremental
+from .backend import BACKENDS
+from .cli import TARGETS, precision
+from .sink import open_sink
+
+# Seconds between checks of the package sources for saved changes.
+POLL = 0.01
+# Magic suffix of the websocket handshake key (RFC 6455).
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+MEDIA_TYPES = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "webp": "image/webp",
+    "gif": "image/gif",
+    "ico": "image/x-icon",
+}
+
+PAGE = """<!doctype html>
+<meta charset="utf-8">
+<title>lastlogo preview</title>
+<style>
+body { font: 13px system-ui, sans-serif; margin: 16px; background: #888; }
+#files { display: flex; flex-wrap: wrap; gap: 16px; align-items: flex-start; }
+figure { margin: 0; padding: 8px; background: #ccc; }
+figcaption { margin-top: 4px; }
+#error { white-space: pre-wrap; background: #fdd; padding: 8px; }
+#error:empty { display: none; }
+</style>
+<pre id="error"></pre>
+<div id="files"></div>
+<script>
+function connect() {
+  const ws = new WebSocket(`ws://${location.host}/ws`);
+  ws.onmessage = (event) => {
+    const msg = JSON.parse(event.data);
+    document.getElementById("error").textContent = msg.error || "";
+    for (const [name, src] of Object.entries(msg.files || {})) {
+      let img = document.getElementById(name);
+      if (!img) {
+        const fig = document.createElement("figure");
+        img = document.createElement("img");
+        img.id = name;
+        const caption = document.createElement("figcaption");
+        caption.textContent = name;
+        fig.append(img, caption);
+        document.getElementById("files").append(fig);
+      }
+      img.src = src;
+    }
+  };
+  ws.onclose = () => setTimeout(connect, 500);
+}
+connect();
+</script>
+"""
+
+
+def _data_url(name, data):
+    kind = MEDIA_TYPES.get(name.rpartition(".")[2], "application/octet-stream")
+    return f"data:{kind};base64,{base64.b64encode(data).decode()}"
+
+
+def ws_frame(payload, opcode=0x1):
+    """One unmasked, unfragmented server frame (RFC 6455); text by default."""
+    n = len(payload)
+    if n < 126:
+        head = bytes([0x80 | opcode, n])
+    elif n < 1 << 16:
+        head = bytes([0x80 | opcode, 126]) + n.to_bytes(2, "big")
+    else:
+        head = bytes([0x80 | opcode, 127]) + n.to_bytes(8, "big")
+    return head + payload
+
+
+async def ws_read(reader):
+    """(opcode, payload) of the next client frame, unmasked."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = int.from_bytes(await reader.readexactly(2), "big")
+    elif n == 127:
+        n = int.from_bytes(await reader.readexactly(8), "big")
+    mask = await reader.readexactly(4) if b1 & 0x80 else bytes(4)
+    data = await reader.readexactly(n)
+    return b0 & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+
+class Watcher:
+    """Keep `targets` rendered in one warm process, rebuilding on save.
+
+    Package sources are polled every POLL seconds. A saved module is
+    re-imported along with the package modules that import it, each after
+    its own dependencies, so `from .icon import ACCENT` sees the new value;
+    reloaded modules get fresh geometry caches. Only targets depending on
+    a changed module are rendered again, and only files whose bytes
+    changed are pushed to the preview. With `out_dir`, files are also
+    written there.
+    """
+
+    def __init__(self, targets, opts=None, out_dir=None):
+        self.targets = list(targets)
+        self.opts = opts or {}
+        self.sink = open_sink(out_dir) if out_dir is not None else None
+        self.files = {}
+        self.failed = set()
+        self.error = None
+        self.clients = set()
+        self.stamps = self._scan()
+        self.imports = {m: incremental.package_imports(m) for m in self.stamps}
+
+    def _scan(self):
+        stamps = {}
+        for path in incremental.PACKAGE_DIR.glob("*.py"):
+            st = path.stat()
+            stamps[path.stem] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def changed(self):
+        """Modules saved, added or removed since the last call."""
+        stamps = self._scan()
+        changed = {
+            m
+            for m in stamps.keys() | self.stamps.keys()
+            if stamps.get(m) != self.stamps.get(m)
+        }
+        self.stamps = stamps
+        return changed
+
+    def deps(self, module):
+        """`module` and the package modules it imports, transitively."""
+        seen, todo = set(), [module]
+        while todo:
+            m = todo.pop()
+            if m not in seen:
+                seen.add(m)
+                todo.extend(self.imports.get(m, ()))
+        return seen
+
+    def build(self, targets):
+        """Render `targets`; return {filename: bytes} of files that changed."""
+        out = {}
+        for target in targets:
+            module = importlib.import_module("." + TARGETS[target], __package__)
+            for names, _, render in module.artifacts(**self.opts):
+                for name, data in zip(names, render(), strict=True):
+                    if self.files.get(name) != data:
+                        out[name] = self.files[name] = data
+        if self.sink is not None:
+            for name, data in out.items():
+                self.sink.write(name, data)
+        return out
+
+    def rebuild(self, changed):
+        """Reload what `changed` modules affect and re-render their targets.
+
+        Returns (targets rebuilt, {filename: bytes} that changed). A failed
+        reload is retried with the next change, whatever file that is in.
+        """
+        changed = changed | self.failed
+        stale = {}
+        try:
+            for m in changed:
+                if m in self.stamps:
+                    self.imports[m] = incremental.package_imports(m)
+                else:
+                    self.imports.pop(m, None)
+            needs = {t: self.deps(TARGETS[t]) for t in self.targets}
+            targets = [t for t in self.targets if needs[t] & changed]
+            used = set().union(*(needs[t] for t in targets))
+            stale = {m: self.deps(m) for m in used if self.deps(m) & changed}
+            # A module's dependencies are a strict subset of its own, so
+            # fewer dependencies means it must be reloaded earlier
+            for m in sorted(stale, key=lambda m: len(stale[m])):
+                name = f"{__package__}.{m}"
+                if name in sys.modules:
+                    importlib.reload(sys.modules[name])
+                else:
+                    importlib.import_module(name)
+            incremental.source_hash.cache.clear()
+            files = self.build(targets)
+        except Exception:
+            self.failed = set(stale) | changed
+            self.error = traceback.format_exc()
+            raise
+        self.failed = set()
+        self.error = None
+        return targets, files
+
+    def message(self, files):
+        msg = dict(files={name: _data_url(name, d) for name, d in files.items()})
+        if self.error:
+            msg["error"] = self.error
+        return ws_frame(json.dumps(msg).encode())
+
+    async def broadcast(self, frame):
+        for writer in list(self.clients):
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionError:
+                self.clients.discard(writer)
+
+    async def poll(self):
+        while True:
+            await asyncio.sleep(POLL)
+            changed = self.changed()
+            if not changed:
+                continue
+            t0 = time.perf_counter()
+            try:
+                targets, files = self.rebuild(changed)
+            except Exception:
+                print(self.error, file=sys.stderr)
+                await self.broadcast(self.message({}))
+                continue
+            if files or targets:
+                await self.broadcast(self.message(files))
+            ms = (time.perf_counter() - t0) * 1e3
+            print(
+                f"{', '.join(sorted(changed))} → {', '.join(targets) or 'nothing'}:"
+                f" {len(files)} files in {ms:.1f} ms"
+            )
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            method, target, _ = request.decode("latin-1").split()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if target == "/ws" and "sec-websocket-key" in headers:
+                await self.websocket(reader, writer, headers["sec-websocket-key"])
+                return
+            name = target.lstrip("/").partition("?")[0]
+            if method != "GET":
+                status, kind, body = "405 Method Not Allowed", "text/plain", b""
+            elif not name:
+                status, kind, body = "200 OK", "text/html", PAGE.encode()
+            elif name in self.files:
+                kind = MEDIA_TYPES.get(name.rpartition(".")[2], "text/plain")
+                status, body = "200 OK", self.files[name]
+            else:
+                status, kind, body = "404 Not Found", "text/plain", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {kind}\r\n"
+                f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def websocket(self, reader, writer, key):
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        writer.write(self.message(self.files))
+        await writer.drain()
+        self.clients.add(writer)
+        try:
+            while True:
+                opcode, payload = await ws_read(reader)
+                if opcode == 0x8:
+                    writer.write(ws_frame(payload[:2], 0x8))
+                    break
+                if opcode == 0x9:
+                    writer.write(ws_frame(payload, 0xA))
+        finally:
+            self.clients.discard(writer)
+
+    async def serve(self, host="127.0.0.1", port=8001):
+        t0 = time.perf_counter()
+        try:
+            self.build(self.targets)
+        except Exception:
+            self.failed = set(self.stamps)
+            self.error = traceback.format_exc()
+            print(self.error, file=sys.stderr)
+        ms = (time.perf_counter() - t0) * 1e3
+        print(f"Rendered {len(self.files)} files in {ms:.0f} ms")
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Watching {incremental.PACKAGE_DIR}; preview on http://{host}:{port}/")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.poll())
+
+
+def run(targets, opts=None, out_dir=None, host="127.0.0.1", port=8001):
+    watcher = Watcher(targets, opts, out_dir)
+    try:
+        asyncio.run(watcher.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher.sink is not None:
+            watcher.sink.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="lastlogo.watch",
+        description="Rebuild targets on every save and show them in a live preview.",
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        metavar="target",
+        help=f"any of {', '.join(TARGETS)} (default: all but favicons)",
+    )
+    parser.add_argument("-o", "--out-dir", help="also write the files here")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--precision", type=precision, metavar="N|full", default=argparse.SUPPRESS
+    )
+    parser.add_argument("--symbols", action="store_true", default=argparse.SUPPRESS)
+    parser.add_argument("--outline", action="store_true", default=argparse.SUPPRESS)
+    args = vars(parser.parse_args(argv))
+    targets = args.pop("targets") or [t for t in TARGETS if t != "favicons"]
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+    out_dir, host, port = args.pop("out_dir"), args.pop("host"), args.pop("port")
+    run(targets, args, out_dir, host, port)
+
+
+if __name__ == "__main__":
+    main()
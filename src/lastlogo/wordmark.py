@@ -0,0 +1,297 @@
+import math
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from .backend import BACKEND, open_canvas
+from .cache import memoize
+from .emit import PRECISION, emitter
+from .glyphs import glyph_rects
+from .incremental import build
+from .mesh import Mesh, concat, pack
+from .occlusion import visible
+from .projection import ANG, ISO, box, project
+from .template import THEMES, compile_template
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
+
+STROKE_W = 6
+# Text drawn by default, e.g. in the logo.
+TEXT = "LAST"
+
+# Indices into the corners returned by projection.box():
+# fbl=0, fbr=1, bbl=2, ftl=3, ftr=4, btl=5, btr=6
+BAR_FACES = np.array(
+    [
+        [3, 5, 2, 0],  # left face (x=x0 plane)
+        [3, 4, 6, 5],  # top face (z=z1 plane)
+        [3, 4, 1, 0],  # front face (y=0 plane)
+    ]
+)
+BAR_EDGES = np.array(
+    [
+        [6, 4],
+        [4, 1],
+        [1, 0],
+        [0, 2],
+        [2, 5],
+        [5, 6],
+        [3, 0],
+        [3, 4],
+        [3, 5],
+    ]
+)
+# Styles of a bar Mesh: its three faces, then its edges.
+BAR_STYLES = ("left", "top", "front", "edge")
+
+
+def bar(x0, z0, x1, z1, d, cam=ISO):
+    """Faces and edges of a cuboid bar.
+
+    Returns (faces, edges) where:
+      faces: (3, 4, 2) array of [left, top, front] polygons for the 3
+        visible faces.
+      edges: (9, 2, 2) array of visible edge segments (6 outline + 3
+        internal).
+    """
+    pts = box(x0, 0, z0, x1, d, z1, cam)
+    return pts[BAR_FACES], pts[BAR_EDGES]
+
+
+@memoize()
+def glyph_bars(char, w=50, h=70, bw=15, d=15):
+    """Bars of `char` in its own cell (origin at its bottom-left) as a Mesh.
+
+    Each bar, back to front, adds its left, top and front faces and its 9
+    edges, styled by BAR_STYLES. A blank glyph gives an empty (falsy) Mesh.
+    """
+    rects = glyph_rects(char, w, h, bw)
+    if not rects:
+        return pack(styles=BAR_STYLES)
+    faces, edges = zip(*(bar(x0, z0, x1, z1, d) for x0, z0, x1, z1 in rects))
+    n = len(rects)
+    return Mesh(
+        np.concatenate(faces).reshape(-1, 2),
+        np.arange(3 * n + 1) * 4,
+        np.tile([0, 1, 2], n),
+        np.concatenate(edges),
+        np.full(9 * n, 3),
+        [(0, 0), (3 * n, 9 * n)],
+        BAR_STYLES,
+    )
+
+
+@memoize()
+def glyph_extent(char, w=50, h=70, bw=15, d=15):
+    """Unpadded (x_min, y_min, x_max, y_max) of `char` in its own cell."""
+    return glyph_bars(char, w, h, bw, d).bounds()
+
+
+@memoize()
+def glyph_geometry(char, w=50, h=70, bw=15, d=15):
+    """Visible geometry of `char` in its own cell as a one-group Mesh.
+
+    Its polygons are disjoint convex pieces styled "bg" (left/top faces)
+    and then "fg" (front faces). Its segments are the outline, styled "fg"
+    and stroked underneath the faces, then every contour (where a front
+    meets a left or top face, see occlusion.visible()), styled "crease" and
+    stroked over them in the fg colour.
+    """
+    letter_bars = glyph_bars(char, w, h, bw, d)
+    faces, silhouette, contours = visible(
+        letter_layers(letter_bars), letter_bars.segments
+    )
+    creases = np.array([(start, end) for start, end, _, _ in contours])
+    return pack(
+        [
+            (piece, role)
+            for role in ("bg", "fg")
+            for pieces, r in faces
+            if r == role
+            for piece in pieces
+        ],
+        [(silhouette, "fg"), (creases, "crease")],
+        styles=("bg", "fg", "crease"),
+    )
+
+
+def glyph_offsets(n, w=50, gap=25):
+    """Screen offsets of `n` glyph cells along the diagonal baseline."""
+    ox = np.arange(n) * float(w + gap)
+    oz = -ox * math.sin(ANG)
+    return project(np.column_stack([ox, np.zeros(n), oz]))
+
+
+@memoize()
+def make_text(w=50, h=70, bw=15, gap=25, d=15, text=TEXT):
+    """The bars of `text` placed as one Mesh, a group per letter."""
+    return concat(
+        [glyph_bars(char, w, h, bw, d) for char in text],
+        glyph_offsets(len(text), w, gap),
+    )
+
+
+@memoize()
+def text_extent(w=50, h=70, bw=15, gap=25, d=15, text=TEXT):
+    """Unpadded (x_min, y_min, x_max, y_max) of make_text(...).
+
+    Raises ValueError if `text` is empty or blank: there is nothing to size.
+    """
+    extents = np.array(
+        [
+            np.add(glyph_extent(char, w, h, bw, d), np.tile(offset, 2))
+            for char, offset in zip(text, glyph_offsets(len(text), w, gap))
+            if glyph_bars(char, w, h, bw, d)
+        ]
+    )
+    if not len(extents):
+        raise ValueError(f"no glyphs to draw in {text!r}")
+    return (*extents[:, :2].min(axis=0).tolist(), *extents[:, 2:].max(axis=0).tolist())
+
+
+def letter_layers(letter_bars):
+    """Faces of one letter's bar Mesh in painter's order as (polygon, role, bar).
+
+    Left and top faces stack in bar order; the front faces all lie in the
+    y=0 plane, so nothing covers them and they go last.
+    """
+    lefts, tops, fronts = (letter_bars.polygons(s) for s in BAR_STYLES[:3])
+    layers = []
+    for i, (left, top) in enumerate(zip(lefts, tops)):
+        layers += [(left, "bg", i), (top, "bg", i)]
+    return layers + [(front, "fg", i) for i, front in enumerate(fronts)]
+
+
+def visible_text(w=50, h=70, bw=15, gap=25, d=15, text=TEXT):
+    """Visible geometry of `text` placed as one Mesh, a group per letter.
+
+    Occlusion is resolved once per glyph (see glyph_geometry()); a new
+    string only copies cached glyphs into place. Blank letters are left out.
+    """
+    chars, offsets = [], []
+    for char, offset in zip(text, glyph_offsets(len(text), w, gap)):
+        if glyph_bars(char, w, h, bw, d):
+            chars.append(glyph_geometry(char, w, h, bw, d))
+            offsets.append(offset)
+    return concat(chars, offsets)
+
+
+def draw_text(out, cx, cy, fg="black", bg="white", **text_kw):
+    """Draw `text` (default LAST) shifted by (cx, cy) through emitter `out`."""
+    colours = {"fg": fg, "bg": bg}
+
+    for letter in visible_text(**text_kw).translate((cx, cy)):
+        out.begin_shape()
+        # Outline first: the faces cover its inner half
+        out.lines(
+            letter.lines("fg"),
+            stroke=fg,
+            stroke_width=STROKE_W,
+            stroke_linecap="round",
+        )
+
+        # One region per fill, so abutting pieces render without seams
+        for role in ("bg", "fg"):
+            out.polygons(letter.polygons(role), fill=colours[role], stroke="none")
+        # Creases last: both sides of them show
+        out.lines(
+            letter.lines("crease"),
+            stroke=fg,
+            stroke_width=STROKE_W,
+            stroke_linecap="round",
+        )
+        out.end_shape()
+
+
+def wordmark_drawing(
+    stream,
+    fg="black",
+    bg="white",
+    accent=None,
+    precision=PRECISION,
+    backend=BACKEND,
+    text=TEXT,
+    symbols=False,
+    outline=False,
+):
+    """Draw the standalone wordmark to `stream` and return its (width, height)."""
+    # Tight bounding box from all geometry
+    pad = STROKE_W / 2 + 1
+    x_min, y_min, x_max, y_max = text_extent(text=text)
+    x_min, y_min = x_min - pad, y_min - pad
+    cw = x_max + pad - x_min
+    ch = y_max + pad - y_min
+
+    canvas = open_canvas(stream, (cw, ch), backend)
+    out = emitter(canvas, precision, symbols, outline)
+    draw_text(out, -x_min, -y_min, fg=fg, bg=bg, text=text)
+    out.close()
+    canvas.close()
+    return canvas.size
+
+
+@memoize()
+def wordmark_template(
+    precision=PRECISION, backend=BACKEND, text=TEXT, symbols=False, outline=False
+):
+    """The wordmark for `text` compiled once into a colour-slot Template."""
+    return compile_template(
+        partial(
+            wordmark_drawing,
+            precision=precision,
+            backend=backend,
+            text=text,
+            symbols=symbols,
+            outline=outline,
+        )
+    )
+
+
+def draw_wordmark(
+    filename,
+    fg="black",
+    bg="white",
+    precision=PRECISION,
+    backend=BACKEND,
+    text=TEXT,
+    symbols=False,
+    outline=False,
+):
+    tpl = wordmark_template(precision, backend, text, symbols, outline)
+    Path(filename).write_bytes(tpl.render(fg=fg, bg=bg))
+    print(f"Saved {filename} ({tpl.size[0]:.0f}x{tpl.size[1]:.0f})")
+
+
+def artifacts(precision=PRECISION, backend=BACKEND, symbols=False, outline=False):
+    """(filenames, params, render) for each file main() writes."""
+    for theme, colours in THEMES.items():
+
+        def render(colours=colours):
+            tpl = wordmark_template(
+                precision, backend, symbols=symbols, outline=outline
+            )
+            return [tpl.render(**colours)]
+
+        params = dict(
+            colours=colours,
+            precision=precision,
+            backend=backend,
+            symbols=symbols,
+            outline=outline,
+        )
+        yield (f"wordmark-{theme}.svg",), params, render
+
+
+def main(
+    out_dir=OUTPUT_DIR,
+    precision=PRECISION,
+    backend=BACKEND,
+    symbols=False,
+    outline=False,
+):
+    build(__name__, artifacts(precision, backend, symbols, outline), out_dir)
+
+
+if __name__ == "__main__":
+    main()